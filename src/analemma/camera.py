@@ -1,5 +1,7 @@
 """Camera control module for ZWO ASI cameras."""
 
+import os
+import threading
 import time
 from dataclasses import dataclass
 from typing import Optional
@@ -18,9 +20,29 @@ except ImportError:
     ASI_AVAILABLE = False
     asi = None
 
+# OpenCV provides a faster edge-aware demosaic when installed
+try:
+    import cv2
+
+    CV2_AVAILABLE = True
+except ImportError:
+    CV2_AVAILABLE = False
+    cv2 = None
+
 
 logger = get_logger(__name__)
 
+# Candidate locations of the ZWO ASI SDK shared library
+ASI_LIB_PATHS = (
+    "/usr/lib/libASICamera2.so",
+    "/usr/local/lib/libASICamera2.so",
+    "/opt/zwo/lib/libASICamera2.so",
+)
+
+# SDK initialization state shared by all controllers and list_cameras()
+_asi_initialized = False
+_asi_init_lock = threading.Lock()
+
 
 class CameraError(Exception):
     """Base exception for camera-related errors."""
@@ -58,7 +80,11 @@ class CameraInfo:
 
 @dataclass
 class CaptureResult:
-    """Capture result container."""
+    """Capture result container.
+
+    The image is backed by the controller's frame buffer and is only valid
+    until the next capture(); use detach() to take ownership of the pixels.
+    """
 
     image: np.ndarray
     exposure_us: int
@@ -66,7 +92,129 @@ class CaptureResult:
     temperature: Optional[float]
     width: int
     height: int
-    timestamp: float
+    timestamp: float  # Wall-clock time at exposure start (seconds since epoch)
+    timestamp_ns: int = 0  # Monotonic clock at exposure start, for ordering
+
+    def detach(self) -> np.ndarray:
+        """Return a copy of the image that survives subsequent captures."""
+        return self.image.copy()
+
+
+# Bayer pattern names indexed by the ASI SDK's BayerPattern value
+BAYER_PATTERNS = ("RGGB", "BGGR", "GRBG", "GBRG")
+
+# OpenCV names Bayer codes after the second row, so sensor RGGB is "BG"
+_CV2_BAYER_CODES = {
+    "RGGB": "COLOR_BayerBG2RGB_EA",
+    "BGGR": "COLOR_BayerRG2RGB_EA",
+    "GRBG": "COLOR_BayerGB2RGB_EA",
+    "GBRG": "COLOR_BayerGR2RGB_EA",
+}
+
+
+def _bayer_pattern_name(props: dict) -> Optional[str]:
+    """Map the SDK's BayerPattern property to a pattern name, if known."""
+    bayer_index = props.get("BayerPattern")
+    if isinstance(bayer_index, int) and 0 <= bayer_index < len(BAYER_PATTERNS):
+        return BAYER_PATTERNS[bayer_index]
+    return None
+
+
+# Bilinear interpolation kernels for the sparse colour planes
+_RB_KERNEL = np.array([[1, 2, 1], [2, 4, 2], [1, 2, 1]], dtype=np.float32) / 4
+_G_KERNEL = np.array([[0, 1, 0], [1, 4, 1], [0, 1, 0]], dtype=np.float32) / 4
+
+
+def _convolve3x3(plane: np.ndarray, kernel: np.ndarray) -> np.ndarray:
+    """Apply a 3x3 kernel using shifted views of a reflect-padded plane."""
+    height, width = plane.shape
+    padded = np.pad(plane, 1, mode="reflect")
+    out = np.zeros_like(plane)
+    for dy in range(3):
+        for dx in range(3):
+            weight = kernel[dy, dx]
+            if weight:
+                out += weight * padded[dy:dy + height, dx:dx + width]
+    return out
+
+
+def debayer(raw: np.ndarray, pattern: str = "RGGB") -> np.ndarray:
+    """Demosaic a single-channel Bayer frame into an RGB image.
+
+    Uses OpenCV's edge-aware demosaic when available, otherwise a
+    vectorized bilinear interpolation over strided Bayer sites.
+
+    Args:
+        raw: Bayer mosaic as a 2D uint8 or uint16 array.
+        pattern: Bayer pattern of the sensor (RGGB, BGGR, GRBG, GBRG).
+
+    Returns:
+        RGB image of shape (height, width, 3) with the input dtype.
+
+    Raises:
+        ValueError: If the input shape or pattern is not supported.
+    """
+    if raw.ndim != 2:
+        raise ValueError(f"Expected a 2D Bayer frame, got shape {raw.shape}")
+    if pattern not in _CV2_BAYER_CODES:
+        raise ValueError(f"Unsupported Bayer pattern: {pattern}")
+
+    if CV2_AVAILABLE:
+        return cv2.demosaicing(raw, getattr(cv2, _CV2_BAYER_CODES[pattern]))
+
+    height, width = raw.shape
+    mosaic = raw.astype(np.float32)
+    rgb = np.empty((height, width, 3), dtype=np.float32)
+
+    for channel, color in enumerate("RGB"):
+        plane = np.zeros_like(mosaic)
+        for index, site in enumerate(pattern):
+            if site == color:
+                row, col = divmod(index, 2)
+                plane[row::2, col::2] = mosaic[row::2, col::2]
+        kernel = _G_KERNEL if color == "G" else _RB_KERNEL
+        rgb[..., channel] = _convolve3x3(plane, kernel)
+
+    info = np.iinfo(raw.dtype)
+    return np.clip(np.rint(rgb), info.min, info.max).astype(raw.dtype)
+
+
+def _ensure_asi_lib_loaded() -> None:
+    """Load the ASI SDK library at most once per process.
+
+    On Raspberry Pi the library is typically in /usr/lib, or its location
+    can be given via the ASI_LIB environment variable.
+
+    Raises:
+        CameraConnectionError: If the library cannot be loaded.
+    """
+    global _asi_initialized
+
+    # Fast path: skip the lock once any caller has loaded the library
+    if _asi_initialized:
+        return
+
+    with _asi_init_lock:
+        if _asi_initialized:
+            return
+
+        env_path = os.environ.get("ASI_LIB")
+        lib_paths = ([env_path] if env_path else []) + list(ASI_LIB_PATHS)
+        for path in lib_paths:
+            try:
+                asi.init(path)
+                break
+            except OSError:
+                continue
+            except asi.ZWO_Error:
+                # zwoasi was already initialized elsewhere in this process
+                break
+        else:
+            raise CameraConnectionError(
+                "Could not find ASI camera library. "
+                "Please install ZWO ASI SDK or set ASI_LIB environment variable."
+            )
+        _asi_initialized = True
 
 
 class CameraController:
@@ -75,6 +223,10 @@ class CameraController:
     # Retry settings
     MAX_RETRIES = 3
     INITIAL_RETRY_DELAY = 1.0  # seconds
+    TRANSIENT_RETRY_DELAY = 0.05  # seconds
+
+    # Error message fragments of transient SDK failures worth retrying at once
+    TRANSIENT_ERRORS = ("timeout", "usb error", "no data available")
 
     def __init__(self, config: CameraConfig, camera_index: int = 0):
         """Initialize camera controller.
@@ -87,6 +239,16 @@ class CameraController:
         self.camera_index = camera_index
         self._camera = None
         self._initialized = False
+        self._frame_buffer: Optional[bytearray] = None
+        self._applied: dict = {}  # Last value written per control
+        self._bayer_pattern: Optional[str] = None  # Resolved once per connection
+        self._exposure_pending = True  # Driver may hold a stale exposure
+        self._transient_retries = 0  # Fast retries after transient errors
+
+    @property
+    def is_connected(self) -> bool:
+        """Whether the controller currently holds an open camera."""
+        return self._camera is not None
 
     def _ensure_asi_initialized(self) -> None:
         """Ensure ASI SDK is initialized."""
@@ -96,31 +258,7 @@ class CameraController:
             )
 
         if not self._initialized:
-            # Initialize the library with the SDK library path
-            # On Raspberry Pi, this is typically in /usr/lib or set via ASI_LIB env
-            try:
-                asi.init("/usr/lib/libASICamera2.so")
-            except asi.ZWO_Error:
-                # Already initialized
-                pass
-            except FileNotFoundError:
-                # Try alternative paths
-                alt_paths = [
-                    "/usr/lib/libASICamera2.so",
-                    "/usr/local/lib/libASICamera2.so",
-                    "/opt/zwo/lib/libASICamera2.so",
-                ]
-                for path in alt_paths:
-                    try:
-                        asi.init(path)
-                        break
-                    except (FileNotFoundError, Exception):
-                        continue
-                else:
-                    raise CameraConnectionError(
-                        "Could not find ASI camera library. "
-                        "Please install ZWO ASI SDK or set ASI_LIB environment variable."
-                    )
+            _ensure_asi_lib_loaded()
             self._initialized = True
 
     def connect(self) -> bool:
@@ -146,12 +284,19 @@ class CameraController:
 
         try:
             self._camera = asi.Camera(self.camera_index)
+            self._applied.clear()
+            self._exposure_pending = True
             self._camera.set_control_value(asi.ASI_BANDWIDTHOVERLOAD, 40)
+            self._camera.disable_dark_subtract()
 
             # Set initial configuration
             self._apply_config()
 
-            logger.info(f"Connected to camera: {self._camera.get_camera_property()['Name']}")
+            # Keep the Bayer pattern so raw captures don't query the SDK
+            props = self._camera.get_camera_property()
+            self._bayer_pattern = _bayer_pattern_name(props) or "RGGB"
+
+            logger.info(f"Connected to camera: {props['Name']}")
             return True
 
         except asi.ZWO_Error as e:
@@ -166,6 +311,7 @@ class CameraController:
                 logger.warning(f"Error closing camera: {e}")
             finally:
                 self._camera = None
+                self._bayer_pattern = None
                 logger.info("Camera disconnected")
 
     def _apply_config(self) -> None:
@@ -174,35 +320,52 @@ class CameraController:
             return
 
         try:
-            # Set exposure
-            self._camera.set_control_value(
-                asi.ASI_EXPOSURE, self.config.exposure_us, auto=False
-            )
-
-            # Set gain
-            self._camera.set_control_value(
-                asi.ASI_GAIN, self.config.gain, auto=False
-            )
+            # Set exposure and gain
+            self._set_control(asi.ASI_EXPOSURE, self.config.exposure_us)
+            self._set_control(asi.ASI_GAIN, self.config.gain)
 
             # Set white balance
-            self._camera.set_control_value(asi.ASI_WB_R, self.config.wb_r, auto=False)
-            self._camera.set_control_value(asi.ASI_WB_B, self.config.wb_b, auto=False)
+            self._set_control(asi.ASI_WB_R, self.config.wb_r)
+            self._set_control(asi.ASI_WB_B, self.config.wb_b)
 
             # Set image format based on config
             if self.config.image_type == "raw":
-                self._camera.set_image_type(asi.ASI_IMG_RAW16)
+                image_type, bytes_per_pixel = asi.ASI_IMG_RAW16, 2
             else:
                 # Use RGB24 for FITS/PNG
-                self._camera.set_image_type(asi.ASI_IMG_RGB24)
+                image_type, bytes_per_pixel = asi.ASI_IMG_RGB24, 3
+
+            if self._applied.get("image_type") != image_type:
+                self._camera.set_image_type(image_type)
+                self._applied["image_type"] = image_type
+
+                # Allocate the frame buffer once so each capture reuses it
+                props = self._camera.get_camera_property()
+                self._frame_buffer = bytearray(
+                    props["MaxWidth"] * props["MaxHeight"] * bytes_per_pixel
+                )
 
             logger.debug(
-                f"Camera configured: exposure={self.config.exposure_us}us, "
-                f"gain={self.config.gain}"
+                "Camera configured: exposure=%dus, gain=%d",
+                self.config.exposure_us,
+                self.config.gain,
             )
 
         except asi.ZWO_Error as e:
             raise CameraError(f"Failed to configure camera: {e}")
 
+    def _set_control(self, control: int, value: int) -> None:
+        """Write a manual control value, skipping the USB transfer if unchanged.
+
+        Args:
+            control: ASI control type.
+            value: Value to set.
+        """
+        if self._applied.get(control) == value:
+            return
+        self._camera.set_control_value(control, value, auto=False)
+        self._applied[control] = value
+
     def set_exposure(self, exposure_us: int) -> None:
         """Set exposure time.
 
@@ -213,8 +376,8 @@ class CameraController:
             raise CameraError("Camera not connected")
 
         self.config.exposure_us = exposure_us
-        self._camera.set_control_value(asi.ASI_EXPOSURE, exposure_us, auto=False)
-        logger.debug(f"Exposure set to {exposure_us}us")
+        self._set_control(asi.ASI_EXPOSURE, exposure_us)
+        logger.debug("Exposure set to %dus", exposure_us)
 
     def set_gain(self, gain: int) -> None:
         """Set gain.
@@ -229,8 +392,8 @@ class CameraController:
             raise ValueError("Gain must be between 0 and 600")
 
         self.config.gain = gain
-        self._camera.set_control_value(asi.ASI_GAIN, gain, auto=False)
-        logger.debug(f"Gain set to {gain}")
+        self._set_control(asi.ASI_GAIN, gain)
+        logger.debug("Gain set to %d", gain)
 
     def get_info(self) -> CameraInfo:
         """Get camera information.
@@ -247,21 +410,13 @@ class CameraController:
         try:
             props = self._camera.get_camera_property()
 
-            # Map bayer pattern
-            bayer_patterns = {
-                0: "RGGB",
-                1: "BGGR",
-                2: "GRBG",
-                3: "GBRG",
-            }
-
             return CameraInfo(
                 name=props["Name"],
                 camera_id=props["CameraID"],
                 max_width=props["MaxWidth"],
                 max_height=props["MaxHeight"],
                 is_color=props["IsColorCam"],
-                bayer_pattern=bayer_patterns.get(props.get("BayerPattern")),
+                bayer_pattern=_bayer_pattern_name(props),
                 supported_bins=props.get("SupportedBins", [1]),
                 pixel_size=props.get("PixelSize", 0),
                 bit_depth=props.get("BitDepth", 8),
@@ -271,9 +426,42 @@ class CameraController:
         except asi.ZWO_Error as e:
             raise CameraError(f"Failed to get camera info: {e}")
 
-    def capture(self) -> CaptureResult:
+    def _get_bayer_pattern(self) -> str:
+        """Get the sensor's Bayer pattern, queried at most once per connection."""
+        if self._bayer_pattern is None:
+            self._bayer_pattern = self.get_info().bayer_pattern or "RGGB"
+        return self._bayer_pattern
+
+    def _discard_pending_exposure(self) -> None:
+        """Abort any exposure or video stream left over from a previous session.
+
+        Ensures the next capture starts a fresh exposure instead of returning
+        a frame that was buffered by the driver earlier. Only called after
+        connecting or after a capture that did not complete, so successful
+        captures don't pay for the extra USB round-trips.
+        """
+        for stop in (self._camera.stop_video_capture, self._camera.stop_exposure):
+            try:
+                stop()
+            except asi.ZWO_Error as e:
+                logger.debug("No pending exposure to discard: %s", e)
+        self._exposure_pending = False
+
+    def _is_transient_error(self, error: Exception) -> bool:
+        """Check whether a capture error is a transient USB/timeout failure."""
+        message = str(error).lower()
+        return any(fragment in message for fragment in self.TRANSIENT_ERRORS)
+
+    def capture(self, copy: bool = False) -> CaptureResult:
         """Capture an image with retry logic.
 
+        The returned image is a view onto the controller's reusable frame
+        buffer and is overwritten by the next capture.
+
+        Args:
+            copy: If True, return an independent copy of the frame that
+                remains valid after subsequent captures.
+
         Returns:
             CaptureResult containing the image and metadata.
 
@@ -283,28 +471,53 @@ class CameraController:
         if self._camera is None:
             raise CameraError("Camera not connected")
 
+        # Resolve SDK symbols once so the retry loop avoids repeated lookups.
+        # Not bound at import time: asi is None without zwoasi, and tests
+        # patch analemma.camera.asi. The other asi.ASI_* lookups run once
+        # per connect or settings change, not per frame.
+        zwo_error = asi.ZWO_Error
+        temperature_control = asi.ASI_TEMPERATURE
+        capture_frame = self._camera.capture
+        get_control_value = self._camera.get_control_value
+
         last_error = None
         retry_delay = self.INITIAL_RETRY_DELAY
 
         for attempt in range(self.MAX_RETRIES):
             try:
-                timestamp = time.time()
+                if self._exposure_pending:
+                    self._discard_pending_exposure()
 
-                # Capture image
-                image = self._camera.capture()
+                started_ns = time.monotonic_ns()
+
+                # Capture image; a failed or interrupted capture may leave
+                # the exposure running, so discard it before the next one
+                self._exposure_pending = True
+                image = capture_frame(buffer_=self._frame_buffer)
+                self._exposure_pending = False
+                if self.config.image_type == "raw" and self.config.debayer_on_capture:
+                    image = debayer(image, self._get_bayer_pattern())
+                elif copy:
+                    image = image.copy()
 
                 # Get temperature if available
                 try:
-                    temp_value = self._camera.get_control_value(asi.ASI_TEMPERATURE)
+                    temp_value = get_control_value(temperature_control)
                     temperature = temp_value[0] / 10.0  # Convert to Celsius
                 except Exception:
                     temperature = None
 
                 logger.info(
-                    f"Image captured: {image.shape}, "
-                    f"exposure={self.config.exposure_us}us, gain={self.config.gain}"
+                    "Image captured: %s, exposure=%dus, gain=%d",
+                    image.shape,
+                    self.config.exposure_us,
+                    self.config.gain,
                 )
 
+                # Single wall-clock read, back-dated to the exposure start
+                elapsed_ns = time.monotonic_ns() - started_ns
+                timestamp = time.time() - elapsed_ns / 1e9
+
                 return CaptureResult(
                     image=image,
                     exposure_us=self.config.exposure_us,
@@ -313,18 +526,25 @@ class CameraController:
                     width=image.shape[1],
                     height=image.shape[0],
                     timestamp=timestamp,
+                    timestamp_ns=started_ns,
                 )
 
-            except asi.ZWO_Error as e:
+            except zwo_error as e:
                 last_error = e
                 logger.warning(
                     f"Capture attempt {attempt + 1}/{self.MAX_RETRIES} failed: {e}"
                 )
 
                 if attempt < self.MAX_RETRIES - 1:
-                    logger.info(f"Retrying in {retry_delay:.1f}s...")
-                    time.sleep(retry_delay)
-                    retry_delay *= 2  # Exponential backoff
+                    if self._is_transient_error(e):
+                        # USB stalls and timeouts clear quickly; skip the backoff
+                        self._transient_retries += 1
+                        logger.info("Transient error, retrying immediately...")
+                        time.sleep(self.TRANSIENT_RETRY_DELAY)
+                    else:
+                        logger.info(f"Retrying in {retry_delay:.1f}s...")
+                        time.sleep(retry_delay)
+                        retry_delay *= 2  # Exponential backoff
 
         raise CaptureError(
             f"Capture failed after {self.MAX_RETRIES} attempts: {last_error}"
@@ -351,11 +571,7 @@ def list_cameras() -> list[dict]:
         return []
 
     try:
-        # Try to initialize if not already done
-        try:
-            asi.init("/usr/lib/libASICamera2.so")
-        except Exception:
-            pass
+        _ensure_asi_lib_loaded()
 
         num_cameras = asi.get_num_cameras()
         cameras = []
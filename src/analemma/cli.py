@@ -1,17 +1,13 @@
 """Command-line interface for Analemma Capture System."""
 
-import json
 from pathlib import Path
 from typing import Optional
 
 import click
-import yaml
 
 from analemma import __version__
-from analemma.camera import CameraController, CameraError, list_cameras
-from analemma.config import Config, load_config
+from analemma.config import Config, dump_config, load_config, save_config
 from analemma.logger import setup_logger
-from analemma.main import AnalemmaSystem
 
 
 @click.group()
@@ -41,6 +37,8 @@ def capture(ctx: click.Context) -> None:
     config = load_config(config_path)
     setup_logger(config.logging)
 
+    from analemma.main import AnalemmaSystem
+
     click.echo("Starting capture...")
 
     system = AnalemmaSystem(config)
@@ -65,6 +63,8 @@ def camera_info(ctx: click.Context) -> None:
     config_path = ctx.obj.get("config_path")
     config = load_config(config_path)
 
+    from analemma.camera import CameraController, CameraError, list_cameras
+
     click.echo("Searching for ZWO ASI cameras...")
 
     cameras = list_cameras()
@@ -113,6 +113,8 @@ def status(ctx: click.Context) -> None:
     config_path = ctx.obj.get("config_path")
     config = load_config(config_path)
 
+    from analemma.main import AnalemmaSystem
+
     system = AnalemmaSystem(config)
     status_info = system.get_status()
 
@@ -168,6 +170,8 @@ def daemon(ctx: click.Context) -> None:
     click.echo(f"  Storage path: {config.storage.base_path}")
     click.echo("\nPress Ctrl+C to stop.\n")
 
+    from analemma.main import AnalemmaSystem
+
     system = AnalemmaSystem(config)
 
     try:
@@ -197,7 +201,7 @@ def config_cmd(
 
     if show:
         config = load_config(config_path)
-        click.echo(yaml.dump(config.to_dict(), default_flow_style=False, allow_unicode=True))
+        click.echo(dump_config(config))
         return
 
     if create:
@@ -205,13 +209,7 @@ def config_cmd(
             if not click.confirm(f"{output} already exists. Overwrite?"):
                 return
 
-        config = Config()
-        output.parent.mkdir(parents=True, exist_ok=True)
-
-        with open(output, "w", encoding="utf-8") as f:
-            yaml.dump(
-                config.to_dict(), f, default_flow_style=False, allow_unicode=True
-            )
+        save_config(Config(), output)
 
         click.echo(f"Configuration file created: {output}")
         return
@@ -239,11 +237,15 @@ def list_images(ctx: click.Context, month: Optional[str], as_json: bool) -> None
     config_path = ctx.obj.get("config_path")
     config = load_config(config_path)
 
+    from analemma.main import AnalemmaSystem
+
     system = AnalemmaSystem(config)
     images = system.storage.list_images(year_month=month)
 
     if as_json:
-        click.echo(json.dumps([str(p) for p in images], indent=2))
+        import json
+
+        click.echo(json.dumps(list(map(str, images)), indent=2))
         return
 
     if not images:
@@ -253,8 +255,7 @@ def list_images(ctx: click.Context, month: Optional[str], as_json: bool) -> None
         return
 
     click.echo(f"Found {len(images)} image(s):\n")
-    for img in images:
-        click.echo(f"  {img}")
+    click.echo("\n".join(f"  {img}" for img in images))
 
 
 @cli.command()
@@ -264,8 +265,15 @@ def list_images(ctx: click.Context, month: Optional[str], as_json: bool) -> None
     is_flag=True,
     help="Re-convert even if TIFF already exists",
 )
+@click.option(
+    "--workers",
+    "-j",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Number of worker processes (default: CPU count)",
+)
 @click.pass_context
-def convert(ctx: click.Context, force: bool) -> None:
+def convert(ctx: click.Context, force: bool, workers: Optional[int]) -> None:
     """Convert all FITS files to TIFF format."""
     config_path = ctx.obj.get("config_path")
     config = load_config(config_path)
@@ -275,7 +283,7 @@ def convert(ctx: click.Context, force: bool) -> None:
     base_path = config.storage.base_path
     click.echo(f"Searching for FITS files in {base_path}...")
 
-    converted = batch_convert_fits(base_path, force=force)
+    converted = batch_convert_fits(base_path, force=force, workers=workers)
 
     if converted:
         click.echo(f"Converted {len(converted)} file(s):")
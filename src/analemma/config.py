@@ -1,10 +1,22 @@
 """Configuration management module for Analemma Capture System."""
 
-from dataclasses import dataclass, field
-from pathlib import Path
-from typing import Optional
+import os
+import re
+from dataclasses import asdict, dataclass, field, fields
+from datetime import time as dtime
+from functools import lru_cache
+from pathlib import Path, PurePath
+from typing import IO, Any, Optional
+from zoneinfo import ZoneInfo
 import yaml
 
+# Prefer the libyaml-backed loader and dumper when PyYAML was built with them
+try:
+    from yaml import CSafeDumper as SafeDumper
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeDumper, SafeLoader
+
 
 @dataclass
 class CameraConfig:
@@ -12,9 +24,10 @@ class CameraConfig:
 
     exposure_us: int = 1000  # 1ms for solar photography
     gain: int = 0  # Minimum gain
-    image_type: str = "fits"  # fits, png
+    image_type: str = "fits"  # fits, png, hdf5
     wb_r: int = 52  # White balance R
     wb_b: int = 95  # White balance B
+    debayer_on_capture: bool = False  # Demosaic raw frames after capture
 
     def __post_init__(self) -> None:
         """Validate configuration values."""
@@ -22,8 +35,47 @@ class CameraConfig:
             raise ValueError("exposure_us must be positive")
         if not 0 <= self.gain <= 300:
             raise ValueError("gain must be between 0 and 300")
-        if self.image_type not in ("fits", "png", "raw"):
-            raise ValueError("image_type must be 'fits', 'png', or 'raw'")
+        if self.image_type not in ("fits", "png", "hdf5", "raw"):
+            raise ValueError("image_type must be 'fits', 'png', 'hdf5', or 'raw'")
+
+
+# H:MM or HH:MM; hour and minute ranges are checked by datetime.time
+_CAPTURE_TIME_RE = re.compile(r"(\d{1,2}):(\d{2})")
+
+
+@lru_cache(maxsize=32)
+def _parse_capture_time(capture_time: str) -> dtime:
+    """Parse an HH:MM string into a time of day.
+
+    Surrounding whitespace, such as a trailing newline from a YAML block
+    scalar, is ignored.
+
+    Raises:
+        ValueError: If the string is not a valid 24-hour HH:MM time.
+    """
+    match = (
+        _CAPTURE_TIME_RE.fullmatch(capture_time.strip())
+        if isinstance(capture_time, str)
+        else None
+    )
+    if match is not None:
+        try:
+            return dtime(int(match.group(1)), int(match.group(2)))
+        except ValueError:
+            pass  # Hour or minute out of range
+    raise ValueError(
+        f"capture_time must be in HH:MM format (24-hour), got '{capture_time}'"
+    )
+
+
+@lru_cache(maxsize=None)
+def _get_zone(name: str) -> ZoneInfo:
+    """Get the ZoneInfo for an IANA name, loading each zone file once.
+
+    Raises:
+        ZoneInfoNotFoundError: If the timezone does not exist.
+    """
+    return ZoneInfo(name)
 
 
 @dataclass
@@ -35,17 +87,27 @@ class ScheduleConfig:
 
     def __post_init__(self) -> None:
         """Validate configuration values."""
-        try:
-            parts = self.capture_time.split(":")
-            if len(parts) != 2:
-                raise ValueError()
-            hour, minute = int(parts[0]), int(parts[1])
-            if not (0 <= hour <= 23 and 0 <= minute <= 59):
-                raise ValueError()
-        except (ValueError, AttributeError):
-            raise ValueError(
-                f"capture_time must be in HH:MM format (24-hour), got '{self.capture_time}'"
-            )
+        _parse_capture_time(self.capture_time)
+
+    @property
+    def time_of_day(self) -> dtime:
+        """capture_time as a datetime.time object."""
+        return _parse_capture_time(self.capture_time)
+
+    @property
+    def tzinfo(self) -> ZoneInfo:
+        """timezone as a ZoneInfo object."""
+        return _get_zone(self.timezone)
+
+    @property
+    def capture_hour(self) -> int:
+        """Hour component of capture_time."""
+        return self.time_of_day.hour
+
+    @property
+    def capture_minute(self) -> int:
+        """Minute component of capture_time."""
+        return self.time_of_day.minute
 
 
 @dataclass
@@ -55,6 +117,11 @@ class StorageConfig:
     base_path: Path = field(default_factory=lambda: Path("/home/pi/analemma/images"))
     monthly_subfolders: bool = True
     min_free_space_mb: int = 1024
+    composite_png_stale_after_s: int = 3600  # Min age before re-encoding composite PNG
+    png_compress_level: int = 1  # zlib level for PNG captures (0-9)
+    fits_dtype: str = "auto"  # auto (keep dtype), uint8, uint16
+    fits_compression: str = "none"  # none, rice (tile-compressed FITS)
+    fits_checksum: bool = False  # Write CHECKSUM/DATASUM cards (extra data pass)
 
     def __post_init__(self) -> None:
         """Convert string path to Path object if necessary."""
@@ -62,6 +129,14 @@ class StorageConfig:
             self.base_path = Path(self.base_path)
         if self.min_free_space_mb < 0:
             raise ValueError("min_free_space_mb must be non-negative")
+        if self.composite_png_stale_after_s < 0:
+            raise ValueError("composite_png_stale_after_s must be non-negative")
+        if not 0 <= self.png_compress_level <= 9:
+            raise ValueError("png_compress_level must be between 0 and 9")
+        if self.fits_dtype not in ("auto", "uint8", "uint16"):
+            raise ValueError("fits_dtype must be 'auto', 'uint8', or 'uint16'")
+        if self.fits_compression not in ("none", "rice"):
+            raise ValueError("fits_compression must be 'none' or 'rice'")
 
 
 @dataclass
@@ -90,12 +165,15 @@ class SyncConfig:
     enabled: bool = False
     remote: str = ""  # e.g. "gdrive:analemma"
     files: str = "tiff"  # "tiff", "composite", "all"
+    rc_url: str = ""  # e.g. "http://localhost:5572" for a running `rclone rcd`
 
     def __post_init__(self) -> None:
         """Validate configuration values."""
         valid_files = ("tiff", "composite", "all")
         if self.files not in valid_files:
             raise ValueError(f"sync.files must be one of {valid_files}")
+        if self.rc_url and not self.rc_url.startswith(("http://", "https://")):
+            raise ValueError("sync.rc_url must be an http:// or https:// URL")
         if self.enabled and not self.remote:
             raise ValueError("sync.remote must be set when sync is enabled")
 
@@ -130,35 +208,59 @@ class Config:
 
     def to_dict(self) -> dict:
         """Convert Config to dictionary."""
-        return {
-            "camera": {
-                "exposure_us": self.camera.exposure_us,
-                "gain": self.camera.gain,
-                "image_type": self.camera.image_type,
-                "wb_r": self.camera.wb_r,
-                "wb_b": self.camera.wb_b,
-            },
-            "schedule": {
-                "capture_time": self.schedule.capture_time,
-                "timezone": self.schedule.timezone,
-            },
-            "storage": {
-                "base_path": str(self.storage.base_path),
-                "monthly_subfolders": self.storage.monthly_subfolders,
-                "min_free_space_mb": self.storage.min_free_space_mb,
-            },
-            "logging": {
-                "level": self.logging.level,
-                "file": str(self.logging.file) if self.logging.file else None,
-                "max_size_mb": self.logging.max_size_mb,
-                "backup_count": self.logging.backup_count,
-            },
-            "sync": {
-                "enabled": self.sync.enabled,
-                "remote": self.sync.remote,
-                "files": self.sync.files,
-            },
-        }
+        return asdict(self, dict_factory=_path_aware_dict_factory)
+
+
+def _path_aware_dict_factory(items: list[tuple[str, Any]]) -> dict:
+    """Build a dict for ``asdict``, converting Path values to strings."""
+    return {key: str(value) if isinstance(value, Path) else value for key, value in items}
+
+
+# Default config paths to try, in order of precedence
+_CONFIG_SEARCH_PATHS = (
+    Path("config/config.yaml"),
+    Path("/etc/analemma/config.yaml"),
+    Path.home() / ".config" / "analemma" / "config.yaml",
+)
+
+
+# Absolute default config path found for each working directory. Only hits
+# on the highest-precedence path are recorded: after a miss or a lower hit,
+# a config created later at a higher-precedence path must still win
+_resolved_config_paths: dict[str, Path] = {}
+
+
+def _resolve_config_path() -> Optional[Path]:
+    """Find the first existing default config file.
+
+    The relative search path is resolved against the current directory. A
+    hit on the first search path is reused until that file disappears;
+    otherwise the search is repeated on every call.
+    """
+    cwd = os.getcwd()
+    cached = _resolved_config_paths.get(cwd)
+    if cached is not None and cached.exists():
+        return cached
+
+    _resolved_config_paths.pop(cwd, None)
+    for index, path in enumerate(_CONFIG_SEARCH_PATHS):
+        # Absolute entries are left unchanged by the join
+        path = Path(cwd, path)
+        if path.exists():
+            if index == 0:
+                _resolved_config_paths[cwd] = path
+            return path
+    return None
+
+
+@lru_cache(maxsize=8)
+def _load_yaml(path: str, mtime_ns: int) -> Optional[dict]:
+    """Parse a YAML file, cached by path and modification time.
+
+    The mtime is part of the cache key so edits to the file are picked up.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.load(f, Loader=SafeLoader)
 
 
 def load_config(config_path: Optional[Path] = None) -> Config:
@@ -170,24 +272,14 @@ def load_config(config_path: Optional[Path] = None) -> Config:
     Returns:
         Config object with loaded or default values.
     """
-    # Default config paths to try
     if config_path is None:
-        default_paths = [
-            Path("config/config.yaml"),
-            Path("/etc/analemma/config.yaml"),
-            Path.home() / ".config" / "analemma" / "config.yaml",
-        ]
-        for path in default_paths:
-            if path.exists():
-                config_path = path
-                break
+        config_path = _resolve_config_path()
 
     if config_path is None or not config_path.exists():
         # Return default configuration
         return Config()
 
-    with open(config_path, "r", encoding="utf-8") as f:
-        data = yaml.safe_load(f)
+    data = _load_yaml(str(config_path), config_path.stat().st_mtime_ns)
 
     if data is None:
         return Config()
@@ -195,6 +287,51 @@ def load_config(config_path: Optional[Path] = None) -> Config:
     return Config.from_dict(data)
 
 
+def _represent_path(dumper: yaml.SafeDumper, path: PurePath) -> yaml.Node:
+    """Represent a Path as a plain YAML string."""
+    return dumper.represent_str(str(path))
+
+
+def _represent_dataclass(dumper: yaml.SafeDumper, obj: Any) -> yaml.Node:
+    """Represent a config dataclass as a YAML mapping of its fields."""
+    return dumper.represent_dict({f.name: getattr(obj, f.name) for f in fields(obj)})
+
+
+class _ConfigDumper(SafeDumper):
+    """YAML dumper that serializes Config objects directly."""
+
+
+_ConfigDumper.add_multi_representer(PurePath, _represent_path)
+for _config_cls in (
+    Config,
+    CameraConfig,
+    ScheduleConfig,
+    StorageConfig,
+    LoggingConfig,
+    SyncConfig,
+):
+    _ConfigDumper.add_representer(_config_cls, _represent_dataclass)
+
+
+def dump_config(config: Config, stream: Optional[IO[str]] = None) -> Optional[str]:
+    """Serialize configuration to YAML.
+
+    Args:
+        config: Config object to serialize.
+        stream: Text stream to write to. If None, the YAML is returned.
+
+    Returns:
+        YAML string if no stream was given, otherwise None.
+    """
+    return yaml.dump(
+        config,
+        stream,
+        Dumper=_ConfigDumper,
+        default_flow_style=False,
+        allow_unicode=True,
+    )
+
+
 def save_config(config: Config, config_path: Path) -> None:
     """Save configuration to YAML file.
 
@@ -205,4 +342,4 @@ def save_config(config: Config, config_path: Path) -> None:
     config_path.parent.mkdir(parents=True, exist_ok=True)
 
     with open(config_path, "w", encoding="utf-8") as f:
-        yaml.dump(config.to_dict(), f, default_flow_style=False, allow_unicode=True)
+        dump_config(config, f)
@@ -1,13 +1,47 @@
 """Logging configuration module for Analemma Capture System."""
 
+import atexit
 import logging
+import queue
 import sys
-from logging.handlers import RotatingFileHandler
+from logging.handlers import (
+    MemoryHandler,
+    QueueHandler,
+    QueueListener,
+    RotatingFileHandler,
+)
 from pathlib import Path
 from typing import Optional
 
 from analemma.config import LoggingConfig
 
+# Active queue listeners, keyed by logger name
+_listeners: dict[str, QueueListener] = {}
+
+# Maximum number of records buffered before the log file is written
+FILE_BUFFER_CAPACITY = 64
+
+
+class _BufferedFileHandler(MemoryHandler):
+    """Buffer records for the log file and write them out in batches.
+
+    The buffer is flushed when it is full, on WARNING or above, or as soon
+    as the listener queue has drained, so a burst of records is handed to
+    the file handler together and nothing is left pending between bursts.
+    """
+
+    def __init__(self, target: logging.Handler, log_queue: queue.Queue):
+        super().__init__(
+            capacity=FILE_BUFFER_CAPACITY,
+            flushLevel=logging.WARNING,
+            target=target,
+        )
+        self._queue = log_queue
+
+    def shouldFlush(self, record: logging.LogRecord) -> bool:
+        """Flush on capacity, severity, or when no more records are queued."""
+        return super().shouldFlush(record) or self._queue.empty()
+
 
 def setup_logger(
     config: Optional[LoggingConfig] = None,
@@ -15,6 +49,9 @@ def setup_logger(
 ) -> logging.Logger:
     """Set up and configure the application logger.
 
+    Records are handed to a queue and written by a background listener
+    thread, so console and file I/O never block the calling thread.
+
     Args:
         config: Logging configuration. If None, uses defaults.
         name: Logger name.
@@ -28,7 +65,8 @@ def setup_logger(
     logger = logging.getLogger(name)
     logger.setLevel(getattr(logging, config.level))
 
-    # Clear existing handlers
+    # Clear existing handlers and stop any previous listener
+    stop_logger(name)
     logger.handlers.clear()
 
     # Log format
@@ -37,13 +75,17 @@ def setup_logger(
         datefmt="%Y-%m-%d %H:%M:%S",
     )
 
+    # Queue drained by a background listener thread (set up below)
+    log_queue: queue.Queue = queue.Queue(-1)
+
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(getattr(logging, config.level))
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    handlers: list[logging.Handler] = [console_handler]
 
     # File handler (if configured)
+    file_error: Optional[str] = None
     if config.file:
         try:
             # Ensure log directory exists
@@ -58,17 +100,52 @@ def setup_logger(
             )
             file_handler.setLevel(getattr(logging, config.level))
             file_handler.setFormatter(formatter)
-            logger.addHandler(file_handler)
+            buffered_handler = _BufferedFileHandler(file_handler, log_queue)
+            buffered_handler.setLevel(getattr(logging, config.level))
+            handlers.append(buffered_handler)
         except PermissionError:
-            logger.warning(
-                f"Cannot write to log file {config.file}, logging to console only"
-            )
+            file_error = f"Cannot write to log file {config.file}, logging to console only"
         except OSError as e:
-            logger.warning(f"Error setting up file logging: {e}, logging to console only")
+            file_error = f"Error setting up file logging: {e}, logging to console only"
+
+    # Route records through the queue
+    logger.addHandler(QueueHandler(log_queue))
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    _listeners[name] = listener
+
+    if file_error:
+        logger.warning(file_error)
 
     return logger
 
 
+def stop_logger(name: str = "analemma") -> None:
+    """Stop the background listener of a logger, flushing queued records.
+
+    Args:
+        name: Logger name passed to setup_logger.
+    """
+    listener = _listeners.pop(name, None)
+    if listener is not None:
+        listener.stop()
+        for handler in listener.handlers:
+            # MemoryHandler.close() drops its target, so grab it first
+            target = handler.target if isinstance(handler, MemoryHandler) else None
+            handler.close()
+            if target is not None:
+                target.close()
+
+
+def _stop_all_loggers() -> None:
+    """Flush and stop every listener at interpreter exit."""
+    for name in list(_listeners):
+        stop_logger(name)
+
+
+atexit.register(_stop_all_loggers)
+
+
 def get_logger(name: str = "analemma") -> logging.Logger:
     """Get an existing logger or create a basic one.
 
@@ -4,18 +4,18 @@ This module integrates all components and provides the capture workflow.
 """
 
 import json
+import os
 import signal
-import sys
-import time
+import threading
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
-from zoneinfo import ZoneInfo
 
 from analemma.camera import (
     CameraConnectionError,
     CameraController,
     CameraError,
+    CameraInfo,
     CaptureError,
 )
 from analemma.config import Config, load_config
@@ -30,6 +30,12 @@ logger = get_logger(__name__)
 # Status file path
 STATUS_FILE = Path.home() / ".analemma" / "status.json"
 
+# Disconnect the camera after this long without a capture (daemon only)
+CAMERA_IDLE_TIMEOUT = 15 * 60  # seconds
+
+# Minimum interval between status file writes while running as a daemon
+STATUS_FLUSH_INTERVAL = 30.0  # seconds
+
 
 class AnalemmaSystem:
     """Main system class that integrates all components."""
@@ -44,12 +50,25 @@ class AnalemmaSystem:
         self.storage = ImageStorage(config.storage)
         self.scheduler: Optional[CaptureScheduler] = None
         self._running = False
+        self._stop_event = threading.Event()  # Set to wake the daemon for shutdown
+        self._camera_info: Optional[CameraInfo] = None  # Static camera properties
+
+        # Camera connection kept open between captures while idle
+        self._camera: Optional[CameraController] = None
+        self._camera_lock = threading.Lock()
+        self._idle_timer: Optional[threading.Timer] = None
 
         # Statistics
         self._consecutive_successes = 0
         self._last_capture_time: Optional[str] = None
         self._last_capture_path: Optional[str] = None
 
+        # Deferred status persistence
+        self._status_dirty = False
+        self._status_lock = threading.Lock()
+        self._flush_timer: Optional[threading.Timer] = None
+        self._last_status_hash = 0  # Hash of the status last written/read
+
         # Load previous status
         self._load_status()
 
@@ -62,23 +81,72 @@ class AnalemmaSystem:
                     self._consecutive_successes = status.get("consecutive_successes", 0)
                     self._last_capture_time = status.get("last_capture_time")
                     self._last_capture_path = status.get("last_capture_path")
+                self._last_status_hash = self._status_hash()
             except (json.JSONDecodeError, OSError):
                 pass
 
+    def _mark_status_dirty(self) -> None:
+        """Record a status change, writing it now unless running as a daemon.
+
+        The daemon coalesces status writes, flushing them STATUS_FLUSH_INTERVAL
+        after the first change and on shutdown to spare the SD card.
+        """
+        with self._status_lock:
+            self._status_dirty = True
+            if self._running:
+                if self._flush_timer is None:
+                    self._flush_timer = threading.Timer(
+                        STATUS_FLUSH_INTERVAL, self._flush_status
+                    )
+                    self._flush_timer.daemon = True
+                    self._flush_timer.start()
+                return
+        self._flush_status()
+
+    def _flush_status(self) -> None:
+        """Write pending status changes to disk."""
+        with self._status_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not self._status_dirty:
+                return
+            self._save_status()
+            self._status_dirty = False
+
+    def _status_hash(self) -> int:
+        """Hash the persisted status fields."""
+        return hash(
+            (
+                self._consecutive_successes,
+                self._last_capture_time,
+                self._last_capture_path,
+            )
+        )
+
     def _save_status(self) -> None:
-        """Save status to status file."""
+        """Save status to status file, skipping the write if unchanged."""
+        status_hash = self._status_hash()
+        if status_hash == self._last_status_hash:
+            return
+
         STATUS_FILE.parent.mkdir(parents=True, exist_ok=True)
+        data = json.dumps(
+            {
+                "consecutive_successes": self._consecutive_successes,
+                "last_capture_time": self._last_capture_time,
+                "last_capture_path": self._last_capture_path,
+            },
+            separators=(",", ":"),
+        ).encode("utf-8")
+
+        # Write to a temp file and rename so readers never see a partial file
+        tmp_path = STATUS_FILE.with_suffix(".tmp")
         try:
-            with open(STATUS_FILE, "w") as f:
-                json.dump(
-                    {
-                        "consecutive_successes": self._consecutive_successes,
-                        "last_capture_time": self._last_capture_time,
-                        "last_capture_path": self._last_capture_path,
-                    },
-                    f,
-                    indent=2,
-                )
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, STATUS_FILE)
+            self._last_status_hash = status_hash
         except OSError as e:
             logger.warning(f"Failed to save status: {e}")
 
@@ -94,20 +162,23 @@ class AnalemmaSystem:
         if not self.storage.check_capacity():
             logger.warning("Low storage capacity, but proceeding with capture")
 
-        camera = CameraController(self.config.camera)
+        self._camera_lock.acquire()
+        self._cancel_idle_disconnect()
 
         try:
-            # Connect to camera
-            camera.connect()
+            # Connect to camera (reusing the connection from a previous capture)
+            camera = self._get_camera()
 
             # Capture image
             result = camera.capture()
 
             # Create metadata
-            tz = ZoneInfo(self.config.schedule.timezone)
+            tz = self.config.schedule.tzinfo
             capture_time = datetime.fromtimestamp(result.timestamp, tz=tz)
 
-            camera_info = camera.get_info()
+            if self._camera_info is None:
+                self._camera_info = camera.get_info()
+            camera_info = self._camera_info
 
             metadata = CaptureMetadata(
                 capture_time=capture_time.isoformat(),
@@ -131,7 +202,7 @@ class AnalemmaSystem:
             self._consecutive_successes += 1
             self._last_capture_time = capture_time.isoformat()
             self._last_capture_path = str(save_path)
-            self._save_status()
+            self._mark_status_dirty()
 
             # Run post-processing pipeline (fault-tolerant)
             if self.config.camera.image_type == "fits":
@@ -139,6 +210,7 @@ class AnalemmaSystem:
                     fits_path=save_path,
                     base_path=self.config.storage.base_path,
                     sync_config=self.config.sync,
+                    png_stale_after_s=self.config.storage.composite_png_stale_after_s,
                 )
 
             logger.info(
@@ -150,30 +222,86 @@ class AnalemmaSystem:
 
         except CameraConnectionError as e:
             logger.error(f"Camera connection failed: {e}")
+            self._drop_camera()
+            self._camera_info = None
             self._consecutive_successes = 0
-            self._save_status()
+            self._mark_status_dirty()
             return None
 
         except CaptureError as e:
             logger.error(f"Image capture failed: {e}")
+            self._drop_camera()
             self._consecutive_successes = 0
-            self._save_status()
+            self._mark_status_dirty()
             return None
 
         except StorageError as e:
             logger.error(f"Image storage failed: {e}")
             self._consecutive_successes = 0
-            self._save_status()
+            self._mark_status_dirty()
             return None
 
         except Exception as e:
             logger.error(f"Unexpected error in capture workflow: {e}")
+            self._drop_camera()
             self._consecutive_successes = 0
-            self._save_status()
+            self._mark_status_dirty()
             return None
 
         finally:
-            camera.disconnect()
+            self._release_camera()
+            self._camera_lock.release()
+
+    def _get_camera(self) -> CameraController:
+        """Get a connected camera controller, connecting only if needed.
+
+        Returns:
+            Connected CameraController.
+
+        Raises:
+            CameraConnectionError: If connection fails.
+        """
+        if self._camera is None:
+            self._camera = CameraController(self.config.camera)
+        if not self._camera.is_connected:
+            self._camera.connect()
+        return self._camera
+
+    def _release_camera(self) -> None:
+        """Release the camera after a capture.
+
+        The daemon keeps the connection open and disconnects after
+        CAMERA_IDLE_TIMEOUT; one-shot runs disconnect immediately.
+        """
+        if self._camera is None:
+            return
+        if self._running:
+            self._idle_timer = threading.Timer(
+                CAMERA_IDLE_TIMEOUT, self._disconnect_idle_camera
+            )
+            self._idle_timer.daemon = True
+            self._idle_timer.start()
+        else:
+            self._drop_camera()
+
+    def _cancel_idle_disconnect(self) -> None:
+        """Cancel a pending idle disconnect."""
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+            self._idle_timer = None
+
+    def _disconnect_idle_camera(self) -> None:
+        """Disconnect the camera once it has been idle long enough."""
+        with self._camera_lock:
+            self._idle_timer = None
+            logger.debug("Camera idle, disconnecting")
+            self._drop_camera()
+
+    def _drop_camera(self) -> None:
+        """Disconnect and discard the camera controller."""
+        if self._camera is not None:
+            self._camera.disconnect()
+            self._camera = None
 
     def run_daemon(self) -> None:
         """Run the system as a daemon with scheduled captures."""
@@ -182,8 +310,7 @@ class AnalemmaSystem:
         # Set up signal handlers
         def signal_handler(signum, frame):
             logger.info(f"Received signal {signum}, shutting down...")
-            self.stop()
-            sys.exit(0)
+            self._stop_event.set()
 
         signal.signal(signal.SIGTERM, signal_handler)
         signal.signal(signal.SIGINT, signal_handler)
@@ -195,15 +322,15 @@ class AnalemmaSystem:
         )
 
         # Start scheduler
+        self._stop_event.clear()
         self.scheduler.start()
         self._running = True
 
         logger.info("Daemon started, waiting for scheduled captures...")
 
-        # Keep running
+        # Sleep until a signal or stop() wakes us
         try:
-            while self._running:
-                time.sleep(1)
+            self._stop_event.wait()
         except KeyboardInterrupt:
             logger.info("Interrupted by user")
         finally:
@@ -212,9 +339,15 @@ class AnalemmaSystem:
     def stop(self) -> None:
         """Stop the daemon gracefully."""
         self._running = False
+        self._stop_event.set()
         if self.scheduler is not None:
             self.scheduler.stop()
             self.scheduler = None
+        with self._camera_lock:
+            self._cancel_idle_disconnect()
+            self._drop_camera()
+        self.storage.close()
+        self._flush_status()
         logger.info("Daemon stopped")
 
     def get_status(self) -> dict:
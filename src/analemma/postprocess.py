@@ -3,9 +3,20 @@
 Handles FITS-to-TIFF conversion, composite generation, and remote sync.
 """
 
+import json
+import logging
+import mmap
+import os
+import queue
+import socket
 import subprocess
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional, Union
 
 import numpy as np
 from astropy.io import fits
@@ -14,8 +25,33 @@ from PIL import Image
 from analemma.config import SyncConfig
 from analemma.logger import get_logger
 
+# Numba provides a multi-threaded SIMD lighten kernel when installed
+try:
+    from numba import njit, prange
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# tifffile writes/reads the raw ndarray buffer directly, bypassing Pillow
+try:
+    import tifffile
+
+    TIFFFILE_AVAILABLE = True
+except ImportError:
+    TIFFFILE_AVAILABLE = False
+
 logger = get_logger(__name__)
 
+# Minimum number of TIFFs before composite blending is spread across threads
+PARALLEL_COMPOSITE_MIN_FILES = 4
+
+# Number of decoded TIFFs queued ahead of the blend loop
+PREFETCH_DEPTH = 2
+
+# Rows blended per step when folding a frame into the memory-mapped composite
+COMPOSITE_STRIP_ROWS = 256
+
 
 class PostProcessError(Exception):
     """Exception raised for post-processing errors."""
@@ -23,6 +59,38 @@ class PostProcessError(Exception):
     pass
 
 
+if NUMBA_AVAILABLE:
+
+    @njit(parallel=True, cache=True, boundscheck=False)
+    def _lighten_kernel(dst, src):
+        # Branchless max with an unconditional store vectorizes to packed
+        # unsigned-max instructions
+        for i in prange(dst.shape[0]):
+            dst[i] = max(dst[i], src[i])
+
+
+def lighten_inplace(dst: np.ndarray, src: np.ndarray) -> None:
+    """Lighten-blend ``src`` into ``dst`` in place (per-pixel maximum).
+
+    Uses a parallel Numba kernel for contiguous uint8 arrays when Numba is
+    installed, otherwise ``np.maximum`` with ``out=dst``.
+
+    Args:
+        dst: Accumulator array, modified in place.
+        src: Array of the same shape to blend in.
+    """
+    if (
+        NUMBA_AVAILABLE
+        and dst.dtype == np.uint8
+        and src.dtype == np.uint8
+        and dst.flags.c_contiguous
+        and src.flags.c_contiguous
+    ):
+        _lighten_kernel(dst.reshape(-1), src.reshape(-1))
+    else:
+        np.maximum(dst, src, out=dst)
+
+
 def fits_to_tiff(fits_path: Path) -> Path:
     """Convert a FITS file to TIFF without stretch.
 
@@ -38,72 +106,241 @@ def fits_to_tiff(fits_path: Path) -> Path:
     Raises:
         PostProcessError: If conversion fails.
     """
-    tiff_path = fits_path.with_suffix(".tif")
+    img_data = _load_fits_as_array(fits_path)
+    return _save_array_as_tiff(img_data, fits_path.with_suffix(".tif"), fits_path)
 
+
+def _load_fits_as_array(fits_path: Path) -> np.ndarray:
+    """Load FITS image data as a uint8 array in (H, W) or (H, W, C) layout.
+
+    Raises:
+        PostProcessError: If the file cannot be read or has no image data.
+    """
     try:
-        with fits.open(fits_path) as hdul:
-            data = hdul[0].data
+        # Memory-map the file so the frame isn't read into RAM before the
+        # single packing copy below
+        with fits.open(fits_path, memmap=True) as hdul:
+            # Tile-compressed files keep the image in the first extension
+            data = next((hdu.data for hdu in hdul if hdu.data is not None), None)
+
+            if data is None:
+                raise PostProcessError(f"No image data in FITS file: {fits_path}")
+
+            if data.ndim == 3:
+                # FITS stores color as (channels, height, width). Interleave
+                # into (H, W, C) one plane at a time: each plane is read
+                # sequentially, several times faster than one copy through a
+                # strided transpose view
+                channels, height, width = data.shape
+                img = np.empty((height, width, channels), dtype=np.uint8)
+                for c in range(channels):
+                    img[..., c] = data[c]
+                return img
+
+            # Convert to contiguous uint8 in one pass; this also detaches the
+            # result from the mapped file
+            return np.array(data, dtype=np.uint8, order="C")
+
+    except PostProcessError:
+        raise
+    except Exception as e:
+        raise PostProcessError(f"Failed to convert {fits_path} to TIFF: {e}")
 
-        if data is None:
-            raise PostProcessError(f"No image data in FITS file: {fits_path}")
 
-        # FITS stores color as (channels, height, width) -- transpose to (H, W, C)
-        if data.ndim == 3:
-            data = np.transpose(data, (1, 2, 0))
+def _write_tiff(tiff_path: Path, img_data: np.ndarray) -> None:
+    """Write a uint8 (H, W) or (H, W, 3) array as an uncompressed TIFF."""
+    if TIFFFILE_AVAILABLE:
+        tifffile.imwrite(
+            tiff_path,
+            img_data,
+            photometric="rgb" if img_data.ndim == 3 else "minisblack",
+            compression=None,
+        )
+        return
 
-        # Ensure uint8
-        img_data = data.astype(np.uint8)
+    # Pillow needs packed rows
+    if not img_data.flags["C_CONTIGUOUS"]:
+        img_data = np.ascontiguousarray(img_data)
+    mode = "RGB" if img_data.ndim == 3 else "L"
+    Image.fromarray(img_data, mode=mode).save(tiff_path, "TIFF")
 
-        # Save as TIFF via Pillow
-        if img_data.ndim == 3:
-            img = Image.fromarray(img_data, mode="RGB")
-        else:
-            img = Image.fromarray(img_data, mode="L")
 
-        img.save(tiff_path, "TIFF")
+def _read_tiff(tiff_path: Path, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Read a TIFF into a writable uint8 ndarray.
+
+    Args:
+        tiff_path: TIFF to read.
+        out: Optional buffer to decode into when tifffile is available. It is
+            ignored (and a new array returned) if the image does not fit it.
+    """
+    if TIFFFILE_AVAILABLE:
+        if out is not None:
+            try:
+                return tifffile.imread(tiff_path, out=out)
+            except ValueError:
+                pass  # Different shape or dtype; decode into a new array
+        return np.asarray(tifffile.imread(tiff_path), dtype=np.uint8)
+    return np.array(Image.open(tiff_path), dtype=np.uint8)
+
+
+def _save_array_as_tiff(img_data: np.ndarray, tiff_path: Path, source: Path) -> Path:
+    """Save a uint8 image array as TIFF.
+
+    Raises:
+        PostProcessError: If the TIFF cannot be written.
+    """
+    try:
+        _write_tiff(tiff_path, img_data)
         logger.info(f"TIFF saved: {tiff_path}")
         return tiff_path
 
-    except PostProcessError:
-        raise
     except Exception as e:
-        raise PostProcessError(f"Failed to convert {fits_path} to TIFF: {e}")
+        raise PostProcessError(f"Failed to convert {source} to TIFF: {e}")
 
 
-def batch_convert_fits(base_path: Path, force: bool = False) -> list[Path]:
+def _iter_files_by_ext(root: Path, ext: str) -> list[Path]:
+    """Recursively find files with the given extension using os.scandir.
+
+    Args:
+        root: Directory to search.
+        ext: File extension including the dot (e.g. ".tif").
+
+    Returns:
+        Sorted list of matching file paths.
+    """
+    matches = []
+    stack = [str(root)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.endswith(ext) and entry.is_file():
+                        matches.append(entry.path)
+        except OSError as e:
+            logger.warning(f"Cannot scan directory: {e}")
+    matches.sort()
+    return [Path(p) for p in matches]
+
+
+def batch_convert_fits(
+    base_path: Path,
+    force: bool = False,
+    workers: Optional[int] = None,
+) -> list[Path]:
     """Convert all FITS files in a directory tree to TIFF.
 
+    Files are converted in a process pool, since decoding and encoding
+    each file is CPU-bound and independent of the others.
+
     Args:
         base_path: Root directory to search for FITS files.
         force: If True, re-convert even if TIFF already exists.
+        workers: Number of worker processes (default: CPU count).
+            1 converts in this process.
 
     Returns:
         List of newly created TIFF paths.
     """
-    fits_files = sorted(base_path.rglob("*.fits"))
-    converted = []
-
-    for fits_path in fits_files:
+    pending = []
+    for fits_path in _iter_files_by_ext(base_path, ".fits"):
         tiff_path = fits_path.with_suffix(".tif")
         if tiff_path.exists() and not force:
             logger.debug(f"Skipping {fits_path.name} (TIFF already exists)")
             continue
-        try:
-            result = fits_to_tiff(fits_path)
-            converted.append(result)
-        except PostProcessError as e:
-            logger.error(f"Conversion failed: {e}")
+        pending.append(fits_path)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(pending))
+
+    if workers <= 1:
+        results = map(_convert_one, pending)
+    else:
+        # Batch small files per task, but keep every worker busy
+        chunksize = max(1, len(pending) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_convert_one, pending, chunksize=chunksize))
 
+    converted = []
+    for result, error in results:
+        if error is not None:
+            logger.error(f"Conversion failed: {error}")
+        else:
+            converted.append(result)
     return converted
 
 
+def _convert_one(fits_path: Path) -> tuple[Optional[Path], Optional[str]]:
+    """Convert one FITS file, returning (tiff_path, None) or (None, error).
+
+    Errors are returned rather than logged so they are reported by the
+    parent process when run in a worker.
+    """
+    try:
+        return fits_to_tiff(fits_path), None
+    except PostProcessError as e:
+        return None, str(e)
+
+
+def _build_composite(base_path: Path) -> tuple[np.ndarray, set[str]]:
+    """Lighten-blend every TIFF under ``base_path`` in memory.
+
+    Returns:
+        The composite array and the names of the TIFFs folded into it.
+
+    Raises:
+        PostProcessError: If there are no TIFF files to blend.
+    """
+    # Find all TIFF files (exclude composite itself)
+    tiff_files = [
+        p for p in _iter_files_by_ext(base_path, ".tif")
+        if p.name != "composite.tif"
+    ]
+
+    if not tiff_files:
+        raise PostProcessError("No TIFF files found for composite")
+
+    logger.info(f"Creating composite from {len(tiff_files)} images")
+
+    # Start with the first image
+    composite = _read_tiff(tiff_files[0])
+    folded = {tiff_files[0].name}
+
+    # Lighten blend: take the maximum of each pixel across all images.
+    # max is associative, so slices of the file list are blended into
+    # partial composites in parallel and then folded together.
+    remaining = tiff_files[1:]
+    workers = min(os.cpu_count() or 1, len(remaining))
+    if len(tiff_files) < PARALLEL_COMPOSITE_MIN_FILES or workers < 2:
+        # Blend straight into the first frame: no second accumulator to
+        # allocate and fold back in
+        _, blended = _blend_tiffs(remaining, composite.shape, out=composite)
+        folded |= blended
+    else:
+        slices = [remaining[i::workers] for i in range(workers)]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            partials = list(
+                executor.map(lambda files: _blend_tiffs(files, composite.shape), slices)
+            )
+
+        for partial, partial_folded in partials:
+            if partial is not None:
+                lighten_inplace(composite, partial)
+                folded |= partial_folded
+
+    return composite, folded
+
+
 def create_composite(
     base_path: Path,
     output_path: Optional[Path] = None,
 ) -> Path:
     """Create analemma composite using lighten blend of all TIFF images.
 
-    Loads images one at a time to minimize memory usage on the Pi.
+    Images are blended by a small thread pool; each worker loads one image
+    at a time into its own partial composite to bound memory usage on the Pi.
 
     Args:
         base_path: Root directory containing TIFF files.
@@ -118,54 +355,436 @@ def create_composite(
     if output_path is None:
         output_path = base_path / "composite.tif"
 
-    # Find all TIFF files (exclude composite itself)
-    tiff_files = sorted(
-        p for p in base_path.rglob("*.tif")
-        if p.name != "composite.tif"
-    )
+    composite, folded = _build_composite(base_path)
 
-    if not tiff_files:
-        raise PostProcessError("No TIFF files found for composite")
+    _composite_array_path(output_path).unlink(missing_ok=True)
+    _save_composite(composite, output_path)
+    _save_composite_state(output_path, folded)
+    return output_path
 
-    logger.info(f"Creating composite from {len(tiff_files)} images")
 
-    # Start with the first image
-    composite = np.array(Image.open(tiff_files[0]), dtype=np.uint8)
+def _prefetch_tiffs(
+    tiff_files: list[Path],
+    shape: Optional[tuple] = None,
+) -> Iterator[tuple[Path, Union[np.ndarray, Exception]]]:
+    """Decode TIFFs on a background thread while the caller blends.
+
+    Up to PREFETCH_DEPTH decoded frames are queued ahead of the consumer,
+    so reading the next file overlaps with processing the current one.
+    Decode errors are yielded in place of the image.
 
-    # Lighten blend: take the maximum of each pixel across all images
-    for tiff_path in tiff_files[1:]:
+    Uncompressed TIFFs are memory-mapped rather than decoded, and the
+    background thread asks the kernel to read their pages ahead, so the
+    blend reads straight from the page cache. Other files are decoded;
+    when ``shape`` is given and tifffile is available, into a small ring of
+    reused buffers instead of a new allocation per file. A yielded frame
+    is only valid until the next one is requested; copy it to keep it.
+
+    Yields:
+        Tuples of (path, image array or the exception raised decoding it).
+    """
+    frames: queue.Queue = queue.Queue(maxsize=PREFETCH_DEPTH)
+
+    # Buffers in flight: PREFETCH_DEPTH queued, one decoding, one in use
+    spare: queue.Queue = queue.Queue()
+    ring = []
+    if shape is not None and TIFFFILE_AVAILABLE:
+        ring = [np.empty(shape, dtype=np.uint8) for _ in range(PREFETCH_DEPTH + 2)]
+        for buf in ring:
+            spare.put(buf)
+
+    # Set when the consumer stops early, so the producer exits instead of
+    # blocking forever on a full queue
+    stop = threading.Event()
+
+    def produce() -> None:
+        for tiff_path in tiff_files:
+            if stop.is_set():
+                return
+            try:
+                img = _map_tiff(tiff_path)
+            except Exception:
+                img = None  # Let the decoder report the problem
+            if img is not None:
+                mapping = getattr(img, "_mmap", None)
+                if mapping is not None and hasattr(mmap, "MADV_WILLNEED"):
+                    mapping.madvise(mmap.MADV_WILLNEED)
+                frames.put((tiff_path, img))
+                continue
+
+            buf = spare.get() if ring else None
+            try:
+                img = _read_tiff(tiff_path, out=buf)
+            except Exception as e:
+                img = e
+            if buf is not None and img is not buf:
+                spare.put(buf)
+            frames.put((tiff_path, img))
+        frames.put(None)
+
+    producer = threading.Thread(target=produce, name="analemma-prefetch", daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = frames.get()
+            if item is None:
+                break
+            yield item
+            if ring and any(item[1] is buf for buf in ring):
+                spare.put(item[1])
+    finally:
+        if producer.is_alive():
+            # Wake a producer waiting for a buffer or queue slot. After the
+            # drain it can finish at most its current file plus the end
+            # marker, which fit in the emptied queue, before seeing stop
+            stop.set()
+            for buf in ring:
+                spare.put(buf)
+            while True:
+                try:
+                    frames.get_nowait()
+                except queue.Empty:
+                    break
+        producer.join()
+
+
+def _blend_tiffs(
+    tiff_files: list[Path],
+    shape: tuple,
+    out: Optional[np.ndarray] = None,
+) -> tuple[Optional[np.ndarray], set[str]]:
+    """Lighten-blend TIFF files into a partial composite.
+
+    Files whose shape differs from ``shape`` or that cannot be read are
+    skipped with a warning.
+
+    Args:
+        tiff_files: TIFFs to blend.
+        shape: Expected image shape.
+        out: Writable accumulator to blend into in place. Without one, the
+            first usable file seeds a new array.
+
+    Returns:
+        Tuple of the partial composite (None if no file was usable and no
+        ``out`` was given) and the names of the files blended into it.
+    """
+    partial = out
+    folded = set()
+    for tiff_path, img in _prefetch_tiffs(tiff_files, shape):
         try:
-            img = np.array(Image.open(tiff_path), dtype=np.uint8)
-            if img.shape != composite.shape:
+            if isinstance(img, Exception):
+                raise img
+            if img.shape != shape:
                 logger.warning(
                     f"Skipping {tiff_path.name}: shape {img.shape} "
-                    f"does not match {composite.shape}"
+                    f"does not match {shape}"
                 )
                 continue
-            composite = np.maximum(composite, img)
+            if partial is None:
+                partial = np.array(img)
+            else:
+                lighten_inplace(partial, img)
+            folded.add(tiff_path.name)
         except Exception as e:
             logger.warning(f"Skipping {tiff_path.name}: {e}")
+    return partial, folded
 
-    # Save composite
-    if composite.ndim == 3:
-        result_img = Image.fromarray(composite, mode="RGB")
-    else:
-        result_img = Image.fromarray(composite, mode="L")
 
+def update_composite(
+    composite_path: Path,
+    new_tiff_path: Path,
+    image: Optional[np.ndarray] = None,
+    png_stale_after_s: Optional[float] = None,
+    strip_rows: int = COMPOSITE_STRIP_ROWS,
+    base_path: Optional[Path] = None,
+) -> Path:
+    """Lighten-blend a new TIFF, and any other unfolded TIFFs, into a composite.
+
+    The composite pixels live in a memory-mapped ``.npy`` file next to the
+    TIFF and the new frame is blended into it ``strip_rows`` rows at a time,
+    so neither image has to be resident in RAM as a whole. Frames already
+    recorded in the composite's state file are not blended again; TIFFs
+    under ``base_path`` that are not recorded there yet (e.g. converted
+    outside the pipeline) are blended in along with the new frame.
+
+    Args:
+        composite_path: Path to the composite TIFF (created if neither it
+            nor its state file exists).
+        new_tiff_path: Path to the TIFF to fold into the composite.
+        image: Pixels of new_tiff_path if already in memory, to skip decoding.
+        png_stale_after_s: Only re-encode the PNG copy once it is older than
+            this many seconds. None always re-encodes it.
+        strip_rows: Number of image rows blended per step.
+        base_path: Root directory searched for unfolded TIFFs. Defaults to
+            the composite's folder.
+
+    Returns:
+        Path to the composite image.
+
+    Raises:
+        PostProcessError: If the update fails.
+    """
+    if _composite_state_path(composite_path).exists() and not composite_path.exists():
+        raise PostProcessError(
+            f"Composite {composite_path} is missing but its state file is not; "
+            "rebuild it with create_composite"
+        )
+    state = _read_composite_state(composite_path)
+    folded = set(state.get("folded", []))
+
+    if base_path is None:
+        base_path = composite_path.parent
+    backlog = [
+        p for p in _iter_files_by_ext(base_path, ".tif")
+        if p.name not in folded
+        and p.name not in (new_tiff_path.name, composite_path.name, "composite.tif")
+    ]
+    if new_tiff_path.name in folded and not backlog:
+        logger.debug(f"{new_tiff_path.name} already in composite")
+        return composite_path
+
+    array_path = _composite_array_path(composite_path)
+    try:
+        composite = _open_composite_array(composite_path, state.get("mtime_ns"))
+        if new_tiff_path.name not in folded:
+            if image is None:
+                image = _open_tiff_rows(new_tiff_path)
+            if composite is not None:
+                if image.shape != composite.shape:
+                    raise PostProcessError(
+                        f"Shape {image.shape} of {new_tiff_path.name} "
+                        f"does not match composite {composite.shape}"
+                    )
+                for y0 in range(0, composite.shape[0], strip_rows):
+                    lighten_inplace(
+                        composite[y0:y0 + strip_rows], image[y0:y0 + strip_rows]
+                    )
+            else:
+                composite = _copy_to_composite_array(image, array_path, strip_rows)
+            folded.add(new_tiff_path.name)
+
+        if backlog:
+            logger.info(f"Blending {len(backlog)} unfolded frames into composite")
+            _, blended = _blend_tiffs(backlog, composite.shape, out=composite)
+            folded |= blended
+
+        composite.flush()
+        _save_composite(composite, composite_path, png_stale_after_s)
+    except Exception as e:
+        # The array may hold a partial blend; rebuild it from the TIFF next time
+        array_path.unlink(missing_ok=True)
+        if isinstance(e, PostProcessError):
+            raise
+        raise PostProcessError(f"Failed to update composite with {new_tiff_path}: {e}")
+
+    _save_composite_state(composite_path, folded)
+    return composite_path
+
+
+def _composite_array_path(composite_path: Path) -> Path:
+    """Get the memory-mappable ``.npy`` copy of a composite's pixels."""
+    return composite_path.with_suffix(".npy")
+
+
+def _map_tiff(tiff_path: Path) -> Optional[np.memmap]:
+    """Memory-map an uncompressed uint8 TIFF read-only.
+
+    Returns:
+        The mapped pixels, or None if tifffile is missing or the file is
+        compressed, tiled or not uint8.
+    """
+    if not TIFFFILE_AVAILABLE:
+        return None
+    try:
+        image = tifffile.memmap(tiff_path, mode="r")
+    except ValueError:
+        return None  # Compressed or not stored contiguously
+    if image.dtype != np.uint8:
+        return None
+    return image
+
+
+def _open_tiff_rows(tiff_path: Path) -> np.ndarray:
+    """Open a TIFF for row-wise reading, memory-mapped when possible.
+
+    Uncompressed TIFFs are mapped directly; anything else is decoded into
+    memory.
+    """
+    image = _map_tiff(tiff_path)
+    return image if image is not None else _read_tiff(tiff_path)
+
+
+def _copy_to_composite_array(
+    image: np.ndarray, array_path: Path, strip_rows: int
+) -> np.memmap:
+    """Create a composite ``.npy`` array holding a copy of ``image``."""
+    composite = np.lib.format.open_memmap(
+        array_path, mode="w+", dtype=np.uint8, shape=image.shape
+    )
+    for y0 in range(0, image.shape[0], strip_rows):
+        composite[y0:y0 + strip_rows] = image[y0:y0 + strip_rows]
+    return composite
+
+
+def _open_composite_array(
+    composite_path: Path, recorded_mtime_ns: Optional[int]
+) -> Optional[np.memmap]:
+    """Memory-map the composite's ``.npy`` array for in-place blending.
+
+    The array is only trusted while the TIFF's mtime matches the one
+    recorded in the state file when both were last written; otherwise it
+    is rebuilt from the TIFF.
+
+    Returns:
+        Writable composite array, or None if no composite exists yet.
+    """
+    array_path = _composite_array_path(composite_path)
+    try:
+        mtime_ns = composite_path.stat().st_mtime_ns
+    except FileNotFoundError:
+        array_path.unlink(missing_ok=True)
+        return None
+
+    if mtime_ns == recorded_mtime_ns and array_path.exists():
+        try:
+            return np.lib.format.open_memmap(array_path, mode="r+")
+        except (OSError, ValueError) as e:
+            logger.warning(f"Rebuilding unreadable composite array {array_path}: {e}")
+
+    return _copy_to_composite_array(
+        _open_tiff_rows(composite_path), array_path, COMPOSITE_STRIP_ROWS
+    )
+
+
+def _save_composite(
+    composite: np.ndarray,
+    output_path: Path,
+    png_stale_after_s: Optional[float] = None,
+) -> None:
+    """Save a composite as TIFF plus a PNG copy for easy viewing.
+
+    Args:
+        composite: Composite pixels.
+        output_path: TIFF output path; the PNG is written alongside it.
+        png_stale_after_s: Skip the PNG if the existing copy is newer than
+            this many seconds. None always writes it.
+    """
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    result_img.save(output_path, "TIFF")
+    _write_tiff(output_path, composite)
 
-    # Also save a PNG copy for easy viewing
     png_path = output_path.with_suffix(".png")
-    result_img.save(png_path, "PNG")
+    if png_stale_after_s is not None and png_path.exists():
+        png_age = time.time() - png_path.stat().st_mtime
+        if png_age < png_stale_after_s:
+            logger.info(f"Composite saved: {output_path} (PNG copy still fresh)")
+            return
+
+    mode = "RGB" if composite.ndim == 3 else "L"
+    Image.fromarray(composite, mode=mode).save(png_path, "PNG")
 
     logger.info(f"Composite saved: {output_path} (and {png_path})")
-    return output_path
+
+
+def _composite_state_path(composite_path: Path) -> Path:
+    """Get the sidecar file listing the frames folded into a composite."""
+    return composite_path.with_suffix(".state.json")
+
+
+def _read_composite_state(composite_path: Path) -> dict:
+    """Read a composite's state file, or an empty dict if unavailable."""
+    state_path = _composite_state_path(composite_path)
+    if not composite_path.exists() or not state_path.exists():
+        return {}
+    try:
+        with open(state_path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        if not isinstance(state, dict):
+            raise ValueError("expected a JSON object")
+        return state
+    except (ValueError, OSError) as e:
+        logger.warning(f"Ignoring unreadable composite state {state_path}: {e}")
+        return {}
+
+
+def _save_composite_state(composite_path: Path, folded: set[str]) -> None:
+    """Record the frames folded into a composite and the TIFF's mtime."""
+    state_path = _composite_state_path(composite_path)
+    try:
+        state = {
+            "folded": sorted(folded),
+            "mtime_ns": composite_path.stat().st_mtime_ns,
+        }
+        with open(state_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+    except OSError as e:
+        logger.warning(f"Failed to save composite state: {e}")
+
+
+# rclone include pattern for each sync.files setting; "all" has no filter
+_SYNC_INCLUDE_PATTERNS = {"tiff": "*.tif", "composite": "composite.*"}
+
+# Timeout for one sync, via either the CLI or the rc daemon
+SYNC_TIMEOUT_S = 300
+
+
+def _sync_via_rc(
+    base_path: Path,
+    sync_config: SyncConfig,
+    include: Optional[str],
+) -> Optional[bool]:
+    """Run a copy on a running ``rclone rcd`` daemon via its HTTP API.
+
+    Returns:
+        True or False for the outcome of the copy, or None if the daemon
+        could not be reached.
+    """
+    # Same include/exclude rules as the CLI flags in sync_to_remote
+    filters = {"ExcludeRule": ["composite.npy"]}
+    if include is not None:
+        filters["IncludeRule"] = [include]
+    payload = {
+        "srcFs": str(base_path),
+        "dstFs": sync_config.remote,
+        "_filter": filters,
+    }
+    request = urllib.request.Request(
+        f"{sync_config.rc_url.rstrip('/')}/sync/copy",
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+
+    logger.info(f"Running sync via rclone rc: {base_path} -> {sync_config.remote}")
+    try:
+        with urllib.request.urlopen(request, timeout=SYNC_TIMEOUT_S) as response:
+            response.read()
+    except urllib.error.HTTPError as e:
+        # rc reports job failures as a JSON body on an error status
+        try:
+            message = json.loads(e.read()).get("error", e.reason)
+        except ValueError:
+            message = e.reason
+        logger.error(f"rclone rc sync failed: {message}")
+        return False
+    except urllib.error.URLError as e:
+        logger.warning(f"rclone rc daemon unreachable at {sync_config.rc_url}: {e.reason}")
+        return None
+    except socket.timeout:
+        logger.error("Sync timed out after 5 minutes")
+        return False
+
+    logger.info("Sync completed successfully")
+    return True
 
 
 def sync_to_remote(base_path: Path, sync_config: SyncConfig) -> bool:
     """Sync files to remote using rclone.
 
+    When ``sync_config.rc_url`` is set, the copy is sent to an already
+    running ``rclone rcd`` daemon, which avoids starting rclone and
+    re-authenticating with the remote on every call. If the daemon cannot
+    be reached, the rclone CLI is used instead.
+
     Args:
         base_path: Local directory to sync from.
         sync_config: Sync configuration.
@@ -177,38 +796,51 @@ def sync_to_remote(base_path: Path, sync_config: SyncConfig) -> bool:
         logger.debug("Sync is disabled")
         return True
 
+    include = _SYNC_INCLUDE_PATTERNS.get(sync_config.files)
+
+    if sync_config.rc_url:
+        try:
+            synced = _sync_via_rc(base_path, sync_config, include)
+        except Exception as e:
+            logger.error(f"Sync failed: {e}")
+            return False
+        if synced is not None:
+            return synced
+        logger.info("Falling back to the rclone CLI")
+
     try:
         # Build include filters based on config
-        include_args = []
-        if sync_config.files == "tiff":
-            include_args = ["--include", "*.tif"]
-        elif sync_config.files == "composite":
-            include_args = ["--include", "composite.*"]
-        # "all" = no filter
+        include_args = ["--include", include] if include is not None else []
 
+        # The composite's working array is a local cache, never uploaded
         cmd = [
             "rclone", "copy",
             str(base_path),
             sync_config.remote,
+            "--exclude", "composite.npy",
             *include_args,
-            "--verbose",
         ]
+        verbose = logger.isEnabledFor(logging.DEBUG)
+        if verbose:
+            cmd.append("--verbose")
 
         logger.info(f"Running sync: {' '.join(cmd)}")
 
+        # rclone logs to stderr; stdout is never needed, so don't buffer it.
         result = subprocess.run(
             cmd,
-            capture_output=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
             text=True,
-            timeout=300,
+            timeout=SYNC_TIMEOUT_S,
         )
 
         if result.returncode != 0:
             logger.error(f"rclone sync failed: {result.stderr}")
             return False
 
-        if result.stdout:
-            logger.debug(f"rclone output: {result.stdout}")
+        if verbose and result.stderr:
+            logger.debug(f"rclone output: {result.stderr}")
 
         logger.info("Sync completed successfully")
         return True
@@ -228,6 +860,7 @@ def run_post_pipeline(
     fits_path: Path,
     base_path: Path,
     sync_config: Optional[SyncConfig] = None,
+    png_stale_after_s: Optional[float] = None,
 ) -> None:
     """Run the full post-capture pipeline.
 
@@ -238,17 +871,37 @@ def run_post_pipeline(
         fits_path: Path to the just-captured FITS file.
         base_path: Storage base path.
         sync_config: Optional sync configuration (None = skip sync).
+        png_stale_after_s: Minimum age before the composite PNG copy is
+            regenerated on an incremental update (None = always).
     """
-    # Step 1: Convert FITS to TIFF
+    # Step 1: Convert FITS to TIFF, keeping the pixels for the composite
+    tiff_path = fits_path.with_suffix(".tif")
+    image = None
     try:
-        fits_to_tiff(fits_path)
+        image = _load_fits_as_array(fits_path)
+        _save_array_as_tiff(image, tiff_path, fits_path)
         logger.info("Post-process: TIFF conversion complete")
     except Exception as e:
+        image = None
         logger.error(f"Post-process: TIFF conversion failed: {e}")
 
-    # Step 2: Update composite
+    # Step 2: Update composite (full rebuild if there is no usable state)
     try:
-        create_composite(base_path)
+        composite_path = base_path / "composite.tif"
+        incremental = (
+            composite_path.exists()
+            and _composite_state_path(composite_path).exists()
+        )
+        if image is not None and incremental:
+            update_composite(
+                composite_path,
+                tiff_path,
+                image=image,
+                png_stale_after_s=png_stale_after_s,
+                base_path=base_path,
+            )
+        else:
+            create_composite(base_path)
         logger.info("Post-process: Composite updated")
     except Exception as e:
         logger.error(f"Post-process: Composite generation failed: {e}")
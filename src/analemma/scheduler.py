@@ -2,8 +2,8 @@
 
 from datetime import datetime
 from typing import Callable, Optional
-from zoneinfo import ZoneInfo
 
+from apscheduler.executors.pool import ThreadPoolExecutor
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
 
@@ -22,6 +22,10 @@ class SchedulerError(Exception):
 class CaptureScheduler:
     """Capture schedule manager using APScheduler."""
 
+    # How late a missed run may still fire, e.g. after the host resumes
+    # from suspend; APScheduler's default of 1 s would skip it instead
+    MISFIRE_GRACE_TIME_S = 3 * 3600
+
     def __init__(
         self,
         config: ScheduleConfig,
@@ -38,45 +42,53 @@ class CaptureScheduler:
         self._scheduler: Optional[BackgroundScheduler] = None
         self._job_id = "daily_capture"
 
-        # Parse capture time
+        # ScheduleConfig validates capture_time on construction; this only
+        # catches configs whose capture_time was changed afterwards
         try:
-            parts = config.capture_time.split(":")
-            self._capture_hour = int(parts[0])
-            self._capture_minute = int(parts[1])
-        except (ValueError, IndexError):
-            raise SchedulerError(
-                f"Invalid capture time format: {config.capture_time}. "
-                "Expected HH:MM format."
-            )
+            time_of_day = config.time_of_day
+        except ValueError as e:
+            raise SchedulerError(f"Invalid capture time format: {e}")
+        self._capture_hour = time_of_day.hour
+        self._capture_minute = time_of_day.minute
 
         # Validate timezone
         try:
-            self._timezone = ZoneInfo(config.timezone)
+            self._timezone = config.tzinfo
         except KeyError:
             raise SchedulerError(f"Invalid timezone: {config.timezone}")
 
+        # Build the daily trigger once so bad settings fail at construction
+        self._trigger = CronTrigger(
+            hour=self._capture_hour,
+            minute=self._capture_minute,
+            timezone=self._timezone,
+        )
+
     def start(self) -> None:
         """Start the scheduler."""
         if self._scheduler is not None and self._scheduler.running:
             logger.warning("Scheduler already running")
             return
 
-        self._scheduler = BackgroundScheduler(timezone=self._timezone)
-
-        # Create cron trigger for daily capture
-        trigger = CronTrigger(
-            hour=self._capture_hour,
-            minute=self._capture_minute,
+        # APScheduler's loop already sleeps on an event until the next fire
+        # time; one worker thread is enough for a single daily job
+        self._scheduler = BackgroundScheduler(
+            executors={"default": ThreadPoolExecutor(max_workers=1)},
             timezone=self._timezone,
         )
 
-        # Add job
+        # Add daily capture job; runs missed by less than the grace time
+        # (e.g. while the host was suspended) collapse into a single capture
+        # instead of firing back to back
         self._scheduler.add_job(
             self._capture_wrapper,
-            trigger=trigger,
+            trigger=self._trigger,
             id=self._job_id,
             name="Daily Solar Capture",
             replace_existing=True,
+            coalesce=True,
+            misfire_grace_time=self.MISFIRE_GRACE_TIME_S,
+            max_instances=1,
         )
 
         self._scheduler.start()
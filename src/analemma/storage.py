@@ -1,11 +1,16 @@
 """Image storage module for Analemma Capture System."""
 
+import io
 import json
+import os
 import shutil
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import asdict, dataclass
 from datetime import datetime
+from functools import cached_property
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
 import numpy as np
 from astropy.io import fits
@@ -15,16 +20,205 @@ from analemma import __version__
 from analemma.config import StorageConfig
 from analemma.logger import get_logger
 
+# OpenCV's libpng encoder is considerably faster than Pillow's when installed
+try:
+    import cv2
+
+    CV2_AVAILABLE = True
+except ImportError:
+    CV2_AVAILABLE = False
+    cv2 = None
+
+# imagecodecs encodes PNG from RGB arrays directly, skipping OpenCV's BGR swap
+try:
+    import imagecodecs
+
+    IMAGECODECS_AVAILABLE = True
+except ImportError:
+    IMAGECODECS_AVAILABLE = False
+
+# h5py enables the monthly HDF5 frame cube format
+try:
+    import h5py
+
+    H5PY_AVAILABLE = True
+except ImportError:
+    H5PY_AVAILABLE = False
+
+# fitsio writes FITS through CFITSIO, with far less Python overhead than astropy
+try:
+    import fitsio
+
+    FITSIO_AVAILABLE = True
+except ImportError:
+    FITSIO_AVAILABLE = False
+
+# orjson serializes the metadata sidecar in C when installed
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = get_logger(__name__)
 
 
+IMAGE_EXTENSIONS = (".fits", ".png", ".h5")
+
+# Width of the fixed-length JSON metadata rows in HDF5 cubes. SWMR cannot
+# append to variable-length string datasets
+HDF5_METADATA_BYTES = 1024
+
+# Worker threads encoding and writing images for save_async
+SAVE_WORKERS = 2
+
+# Formats accepted by ImageStorage.save
+SUPPORTED_IMAGE_TYPES = ("fits", "png", "hdf5")
+
+
+def _iter_images(root: Path, dir_mtimes: Optional[dict[str, int]] = None):
+    """Yield paths of image files under ``root`` with one scandir walk.
+
+    Args:
+        root: Directory to walk.
+        dir_mtimes: If given, filled with the mtime of each directory visited,
+            taken before it is read.
+    """
+    stack = [os.fspath(root)]
+    while stack:
+        path = stack.pop()
+        try:
+            if dir_mtimes is not None:
+                dir_mtimes[path] = os.stat(path).st_mtime_ns
+            with os.scandir(path) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.endswith(IMAGE_EXTENSIONS):
+                        yield entry.path
+        except FileNotFoundError:
+            continue
+
+
+def _count_cube_frames(path: str) -> int:
+    """Count the frames in an HDF5 cube, or 0 if it cannot be read."""
+    if not H5PY_AVAILABLE:
+        return 0
+    try:
+        with h5py.File(path, "r") as f:
+            return f["frames"].shape[0] if "frames" in f else 0
+    except (OSError, KeyError) as e:
+        logger.warning(f"Cannot count frames in {path}: {e}")
+        return 0
+
+
+def _count_images(root: Path) -> int:
+    """Count captures under ``root`` in one walk.
+
+    Image files count once each, matching names only; HDF5 cubes count
+    their frames.
+    """
+    count = 0
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            if name.endswith(".h5"):
+                count += _count_cube_frames(os.path.join(dirpath, name))
+            elif name.endswith(IMAGE_EXTENSIONS):
+                count += 1
+    return count
+
+
+def _json_default(obj):
+    """Convert numpy scalars and arrays for the stdlib JSON encoder."""
+    if isinstance(obj, (np.generic, np.ndarray)):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _dump_json(obj: dict) -> bytes:
+    """Serialize ``obj`` as compact UTF-8 JSON, accepting numpy values."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(
+        obj, separators=(",", ":"), ensure_ascii=False, default=_json_default
+    ).encode("utf-8")
+
+
+def _as_uint8(image: np.ndarray) -> np.ndarray:
+    """Return ``image`` as contiguous uint8, copying only if it is not already."""
+    if image.dtype == np.uint8 and image.flags.c_contiguous:
+        return image
+    return np.ascontiguousarray(image, dtype=np.uint8)
+
+
+def _to_uint16(image: np.ndarray) -> np.ndarray:
+    """Store sensor data as 16-bit integers, rounding and clipping floats."""
+    if image.dtype == np.uint16:
+        return image
+    if image.dtype == np.uint8:
+        return image.astype(np.uint16)
+    if image.dtype.kind == "f":
+        out = np.rint(image)
+        np.clip(out, 0, 65535, out=out)
+        return out.astype(np.uint16)
+    return np.clip(image, 0, 65535).astype(np.uint16)
+
+
+def _fits_tile_shape(fits_data: np.ndarray) -> tuple[int, ...]:
+    """Get a FITS compression tile covering one full image plane."""
+    return (1, *fits_data.shape[1:]) if fits_data.ndim == 3 else fits_data.shape
+
+
+def _stretch_params(image: np.ndarray) -> tuple[float, float]:
+    """Get (alpha, beta) mapping a float image's min..max onto 0..255."""
+    lo, hi = float(image.min()), float(image.max())
+    alpha = 255.0 / (hi - lo) if hi > lo else 0.0
+    return alpha, -lo * alpha
+
+
+def _to_uint8(image: np.ndarray) -> np.ndarray:
+    """Quantize an image to 8 bits for display formats.
+
+    16-bit sensor data keeps its top byte, float data is stretched from its
+    min..max onto 0..255, and other integer types are clipped.
+    """
+    if image.dtype == np.uint8:
+        return _as_uint8(image)
+    if image.dtype == np.uint16:
+        return (image >> 8).astype(np.uint8)
+    if image.dtype.kind == "f":
+        # Scale, round and clip in one float32 buffer without temporaries
+        alpha, beta = _stretch_params(image)
+        out = np.empty(image.shape, dtype=np.float32)
+        np.multiply(image, alpha, out=out, casting="unsafe")
+        np.add(out, beta + 0.5, out=out)
+        np.clip(out, 0, 255, out=out)
+        return out.astype(np.uint8)
+    return np.clip(image, 0, 255).astype(np.uint8)
+
+
+# Comment written beside each metadata keyword in FITS headers
+_FITS_CARD_COMMENTS = {
+    "DATE-OBS": "Capture time (ISO 8601)",
+    "INSTRUME": "Camera model",
+    "EXPTIME": "[s] Exposure time",
+    "GAIN": "Sensor gain",
+    "IMAGETYP": "Frame type",
+    "OBJECT": "Target",
+    "TIMESYS": "Time zone of DATE-OBS",
+    "SWCREATE": "Capture software",
+    "CCD-TEMP": "[C] Sensor temperature",
+}
+
+
 class StorageError(Exception):
     """Exception raised for storage-related errors."""
 
     pass
 
 
-@dataclass
+@dataclass(frozen=True)
 class CaptureMetadata:
     """Metadata for a captured image."""
 
@@ -55,6 +249,19 @@ class CaptureMetadata:
             header["CCD-TEMP"] = self.temperature
         return header
 
+    @cached_property
+    def fits_header(self) -> dict:
+        """FITS header cards without empty values, built once per instance."""
+        return {k: v for k, v in self.to_fits_header().items() if v is not None}
+
+    @cached_property
+    def fits_cards(self) -> tuple[tuple[str, Any, str], ...]:
+        """FITS header cards as (keyword, value, comment) for batch insertion."""
+        return tuple(
+            (key, value, _FITS_CARD_COMMENTS.get(key, ""))
+            for key, value in self.fits_header.items()
+        )
+
     def to_dict(self) -> dict:
         """Convert metadata to dictionary for JSON export."""
         return {
@@ -120,6 +327,15 @@ class ImageStorage:
             config: Storage configuration.
         """
         self.config = config
+        self._local = threading.local()  # Per-thread reused planar colour buffer
+        self._image_count: Optional[int] = None  # Lazily counted, then maintained
+        self._count_lock = threading.Lock()
+        self._known_dirs: set[Path] = set()  # Month folders already created
+        self._executor = ThreadPoolExecutor(
+            max_workers=SAVE_WORKERS, thread_name_prefix="analemma-save"
+        )
+        # search path -> (directory mtimes, sorted images)
+        self._list_cache: dict[Path, tuple[dict[str, int], list[Path]]] = {}
         self._ensure_base_path()
 
     def _ensure_base_path(self) -> None:
@@ -144,18 +360,40 @@ class ImageStorage:
             Full path for the image file.
         """
         # Generate filename
-        filename = f"analemma_{timestamp.strftime('%Y%m%d_%H%M%S')}.{extension}"
-
-        if self.config.monthly_subfolders:
-            # Create monthly subfolder path
-            subfolder = timestamp.strftime("%Y-%m")
-            save_dir = self.config.base_path / subfolder
+        ts = timestamp
+        filename = (
+            f"analemma_{ts.year:04d}{ts.month:02d}{ts.day:02d}"
+            f"_{ts.hour:02d}{ts.minute:02d}{ts.second:02d}.{extension}"
+        )
+
+        save_dir = self._save_dir(ts)
+        if save_dir not in self._known_dirs:
+            # Create the monthly subfolder once per month per process
             save_dir.mkdir(parents=True, exist_ok=True)
-        else:
-            save_dir = self.config.base_path
+            self._known_dirs.add(save_dir)
 
         return save_dir / filename
 
+    def _save_dir(self, timestamp: datetime) -> Path:
+        """Get the directory a capture at ``timestamp`` is saved in."""
+        if self.config.monthly_subfolders:
+            return self.config.base_path / f"{timestamp.year:04d}-{timestamp.month:02d}"
+        return self.config.base_path
+
+    def _forget_missing_dir(self, timestamp: datetime) -> bool:
+        """Drop the cached save directory for ``timestamp`` if it was removed.
+
+        Returns:
+            True if the directory had been created by this process but no
+            longer exists, so a retried save will recreate it.
+        """
+        save_dir = self._save_dir(timestamp)
+        if save_dir in self._known_dirs and not save_dir.is_dir():
+            self._known_dirs.discard(save_dir)
+            logger.warning(f"Save directory {save_dir} disappeared; recreating it")
+            return True
+        return False
+
     def save(
         self,
         image: np.ndarray,
@@ -167,10 +405,10 @@ class ImageStorage:
         Args:
             image: Image data as numpy array.
             metadata: Capture metadata.
-            image_type: Image format (fits, png).
+            image_type: Image format (fits, png, hdf5).
 
         Returns:
-            Path to saved image file.
+            Path to saved image file (the monthly cube for hdf5).
 
         Raises:
             StorageError: If save fails.
@@ -179,12 +417,51 @@ class ImageStorage:
         capture_time = datetime.fromisoformat(metadata.capture_time)
 
         if image_type == "fits":
-            return self._save_fits(image, metadata, capture_time)
+            writer = self._save_fits
         elif image_type == "png":
-            return self._save_png(image, metadata, capture_time)
+            writer = self._save_png
+        elif image_type == "hdf5":
+            writer = self._save_hdf5
         else:
             raise StorageError(f"Unsupported image type: {image_type}")
 
+        try:
+            return writer(image, metadata, capture_time)
+        except StorageError:
+            # A folder removed behind the daemon's back (cleanup, move-style
+            # sync) is recreated and the save retried once
+            if not self._forget_missing_dir(capture_time):
+                raise
+            return writer(image, metadata, capture_time)
+
+    def save_async(
+        self,
+        image: np.ndarray,
+        metadata: CaptureMetadata,
+        image_type: str = "fits",
+    ) -> "Future[Path]":
+        """Save image and metadata on a background thread.
+
+        The image is copied before it is queued, so the caller may reuse its
+        buffer (e.g. for the next camera frame) as soon as this returns.
+
+        Args:
+            image: Image data as numpy array.
+            metadata: Capture metadata.
+            image_type: Image format (fits, png, hdf5).
+
+        Returns:
+            Future resolving to the saved image path; its result() raises
+            StorageError if the save fails.
+        """
+        if image_type not in SUPPORTED_IMAGE_TYPES:
+            raise StorageError(f"Unsupported image type: {image_type}")
+        return self._executor.submit(self.save, np.array(image), metadata, image_type)
+
+    def close(self) -> None:
+        """Wait for pending background saves and stop the worker threads."""
+        self._executor.shutdown(wait=True)
+
     def _save_fits(
         self,
         image: np.ndarray,
@@ -202,36 +479,201 @@ class ImageStorage:
             Path to saved FITS file.
         """
         save_path = self._get_save_path(capture_time, "fits")
+        # Written next to the destination, then renamed into place
+        tmp_path = save_path.with_name(save_path.name + ".tmp")
 
         try:
+            image = self._fits_pixels(image)
+
             # Create FITS HDU
             # Note: FITS expects data in (height, width, channels) or (height, width)
             if len(image.shape) == 3:
-                # Color image - transpose for FITS convention
-                # FITS uses (channels, height, width) for color images
-                fits_data = np.transpose(image, (2, 0, 1))
+                # Color image - FITS uses (channels, height, width). A
+                # transposed view would be copied by astropy on every write,
+                # so fill a reused planar buffer with one contiguous copy.
+                fits_data = self._planar_buffer(image)
             else:
                 fits_data = image
 
-            hdu = fits.PrimaryHDU(fits_data)
+            if FITSIO_AVAILABLE:
+                self._write_fits_fitsio(tmp_path, fits_data, metadata)
+            else:
+                self._write_fits_astropy(tmp_path, fits_data, metadata)
+            is_new = not save_path.exists()
+            os.replace(tmp_path, save_path)
+            self._count_saved(is_new)
 
-            # Add metadata to header
-            for key, value in metadata.to_fits_header().items():
-                if value is not None:
-                    hdu.header[key] = value
+            logger.info(f"FITS image saved: {save_path}")
+            return save_path
 
-            # Add image dimensions
-            hdu.header["NAXIS1"] = metadata.width
-            hdu.header["NAXIS2"] = metadata.height
+        except Exception as e:
+            tmp_path.unlink(missing_ok=True)
+            raise StorageError(f"Failed to save FITS image: {e}")
 
-            # Write FITS file
-            hdu.writeto(save_path, overwrite=True)
+    def _fits_pixels(self, image: np.ndarray) -> np.ndarray:
+        """Convert image to the configured FITS pixel type.
 
-            logger.info(f"FITS image saved: {save_path}")
+        In auto mode every frame keeps its dtype, so calibrated or normalized
+        float data is stored as-is. Setting uint16 stores float sensor output
+        in half the bytes of float32; the FITS writers add BZERO for unsigned
+        16-bit data.
+        """
+        fits_dtype = self.config.fits_dtype
+        if fits_dtype == "uint16":
+            return _to_uint16(image)
+        if fits_dtype == "uint8":
+            return _to_uint8(image)
+        return image
+
+    def _write_fits_fitsio(
+        self, path: Path, fits_data: np.ndarray, metadata: CaptureMetadata
+    ) -> None:
+        """Write a FITS file with fitsio (CFITSIO)."""
+        compress = {}
+        if self.config.fits_compression == "rice":
+            compress = {
+                "compress": "RICE",
+                "tile_dims": list(_fits_tile_shape(fits_data)),
+            }
+        with fitsio.FITS(str(path), "rw", clobber=True) as f:
+            header = [
+                {"name": key, "value": value, "comment": comment}
+                for key, value, comment in metadata.fits_cards
+            ]
+            f.write(fits_data, header=header, **compress)
+            if self.config.fits_checksum:
+                f[-1].write_checksum()
+
+    def _write_fits_astropy(
+        self, path: Path, fits_data: np.ndarray, metadata: CaptureMetadata
+    ) -> None:
+        """Write a FITS file with astropy."""
+        if self.config.fits_compression == "rice":
+            # RICE tiles of one colour plane each; the compressed image
+            # lives in an extension after an empty primary HDU
+            hdu = fits.CompImageHDU(
+                fits_data,
+                compression_type="RICE_1",
+                tile_shape=_fits_tile_shape(fits_data),
+            )
+            hdu.header.extend(metadata.fits_cards)
+            buf = io.BytesIO()
+            fits.HDUList([fits.PrimaryHDU(), hdu]).writeto(
+                buf, checksum=self.config.fits_checksum
+            )
+            path.write_bytes(buf.getbuffer())
+            return
+
+        hdu = fits.PrimaryHDU(fits_data)
+
+        # Add metadata to header in one batch rather than card by card
+        hdu.header.extend(metadata.fits_cards)
+
+        # Add image dimensions
+        hdu.header["NAXIS1"] = metadata.width
+        hdu.header["NAXIS2"] = metadata.height
+
+        # Serialize in memory so the file is written in one sequential write
+        # instead of astropy's many small header/padding writes
+        buf = io.BytesIO()
+        hdu.writeto(buf, checksum=self.config.fits_checksum)
+        path.write_bytes(buf.getbuffer())
+
+    def _save_hdf5(
+        self,
+        image: np.ndarray,
+        metadata: CaptureMetadata,
+        capture_time: datetime,
+    ) -> Path:
+        """Append image to the month's HDF5 frame cube.
+
+        Frames go into a ``frames`` dataset chunked one frame per chunk, so
+        each capture is a single-chunk append; the matching row of the
+        ``metadata`` dataset holds the capture metadata as JSON.
+
+        Args:
+            image: Image data.
+            metadata: Capture metadata.
+            capture_time: Capture timestamp.
+
+        Returns:
+            Path to the HDF5 cube.
+
+        Raises:
+            StorageError: If h5py is missing or the frame cannot be appended.
+        """
+        if not H5PY_AVAILABLE:
+            raise StorageError("HDF5 storage requires h5py (pip install h5py)")
+
+        save_dir = self._get_save_path(capture_time, "h5").parent
+        save_path = save_dir / f"analemma_{capture_time.year:04d}-{capture_time.month:02d}.h5"
+        # Frames keep their native dtype so RAW16 and float data survive
+        frame = np.ascontiguousarray(image)
+        meta_json = _dump_json(metadata.to_dict())
+        if len(meta_json) > HDF5_METADATA_BYTES:
+            raise StorageError(
+                f"Metadata is {len(meta_json)} bytes, over the "
+                f"{HDF5_METADATA_BYTES}-byte HDF5 metadata row"
+            )
+
+        try:
+            with h5py.File(save_path, "a", libver="latest") as f:
+                if "frames" not in f:
+                    f.create_dataset(
+                        "frames",
+                        shape=(0, *frame.shape),
+                        maxshape=(None, *frame.shape),
+                        chunks=(1, *frame.shape),
+                        dtype=frame.dtype,
+                        compression="lzf",
+                    )
+                    f.create_dataset(
+                        "metadata",
+                        shape=(0,),
+                        maxshape=(None,),
+                        dtype=f"S{HDF5_METADATA_BYTES}",
+                        chunks=(64,),
+                        compression="lzf",
+                    )
+                frames, meta = f["frames"], f["metadata"]
+                if frames.shape[1:] != frame.shape or frames.dtype != frame.dtype:
+                    raise StorageError(
+                        f"Frame {frame.dtype}{frame.shape} does not match "
+                        f"cube {frames.dtype}{frames.shape[1:]} in {save_path}"
+                    )
+
+                # Readers may follow the cube while it is being appended to
+                f.swmr_mode = True
+                index = frames.shape[0]
+                frames.resize(index + 1, axis=0)
+                meta.resize(index + 1, axis=0)
+                frames[index] = frame
+                meta[index] = meta_json
+            self._count_saved(True)
+
+            logger.info(f"HDF5 frame {index} appended: {save_path}")
             return save_path
 
+        except StorageError:
+            raise
         except Exception as e:
-            raise StorageError(f"Failed to save FITS image: {e}")
+            raise StorageError(f"Failed to append HDF5 frame: {e}")
+
+    def _count_saved(self, is_new: bool) -> None:
+        """Update the cached image count after a successful save."""
+        if is_new:
+            with self._count_lock:
+                if self._image_count is not None:
+                    self._image_count += 1
+
+    def _planar_buffer(self, image: np.ndarray) -> np.ndarray:
+        """Copy an (H, W, C) image into this thread's reused (C, H, W) buffer."""
+        shape = (image.shape[2], image.shape[0], image.shape[1])
+        buf = getattr(self._local, "chw_buffer", None)
+        if buf is None or buf.shape != shape or buf.dtype != image.dtype:
+            buf = self._local.chw_buffer = np.empty(shape, dtype=image.dtype)
+        np.copyto(buf, np.moveaxis(image, -1, 0))
+        return buf
 
     def _save_png(
         self,
@@ -253,22 +695,17 @@ class ImageStorage:
         json_path = save_path.with_suffix(".json")
 
         try:
-            # Convert numpy array to PIL Image
-            if len(image.shape) == 3 and image.shape[2] == 3:
-                # RGB image
-                pil_image = Image.fromarray(image.astype(np.uint8), mode="RGB")
-            elif len(image.shape) == 2:
-                # Grayscale
-                pil_image = Image.fromarray(image.astype(np.uint8), mode="L")
+            is_new = not save_path.exists()
+            if IMAGECODECS_AVAILABLE:
+                self._write_png_imagecodecs(image, save_path)
+            elif CV2_AVAILABLE:
+                self._write_png_cv2(image, save_path)
             else:
-                raise StorageError(f"Unsupported image shape: {image.shape}")
-
-            # Save PNG
-            pil_image.save(save_path, "PNG")
+                self._write_png_pil(image, save_path)
+            self._count_saved(is_new)
 
             # Save metadata to JSON
-            with open(json_path, "w", encoding="utf-8") as f:
-                json.dump(metadata.to_dict(), f, indent=2, ensure_ascii=False)
+            json_path.write_bytes(_dump_json(metadata.to_dict()))
 
             logger.info(f"PNG image saved: {save_path}")
             logger.info(f"Metadata saved: {json_path}")
@@ -277,6 +714,58 @@ class ImageStorage:
         except Exception as e:
             raise StorageError(f"Failed to save PNG image: {e}")
 
+    def _write_png_imagecodecs(self, image: np.ndarray, save_path: Path) -> None:
+        """Encode a PNG with imagecodecs' libpng binding."""
+        if not (image.ndim == 2 or (image.ndim == 3 and image.shape[2] == 3)):
+            raise StorageError(f"Unsupported image shape: {image.shape}")
+
+        data = imagecodecs.png_encode(
+            _to_uint8(image), level=self.config.png_compress_level
+        )
+        save_path.write_bytes(data)
+
+    def _write_png_cv2(self, image: np.ndarray, save_path: Path) -> None:
+        """Encode a PNG with OpenCV, swapping RGB frames to its BGR order."""
+        if image.dtype.kind == "f":
+            # Stretch and cast in one C pass instead of NumPy temporaries
+            alpha, beta = _stretch_params(image)
+            image = cv2.convertScaleAbs(image, alpha=alpha, beta=beta)
+        else:
+            image = _to_uint8(image)
+
+        if len(image.shape) == 3 and image.shape[2] == 3:
+            data = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+        elif len(image.shape) == 2:
+            data = image
+        else:
+            raise StorageError(f"Unsupported image shape: {image.shape}")
+
+        params = [cv2.IMWRITE_PNG_COMPRESSION, self.config.png_compress_level]
+        if not cv2.imwrite(str(save_path), data, params):
+            raise StorageError(f"OpenCV could not write {save_path}")
+
+    def _write_png_pil(self, image: np.ndarray, save_path: Path) -> None:
+        """Encode a PNG with Pillow."""
+        # Convert numpy array to PIL Image
+        if len(image.shape) == 3 and image.shape[2] == 3:
+            # RGB image
+            pil_image = Image.fromarray(_to_uint8(image), mode="RGB")
+        elif len(image.shape) == 2:
+            # Grayscale
+            pil_image = Image.fromarray(_to_uint8(image), mode="L")
+        else:
+            raise StorageError(f"Unsupported image shape: {image.shape}")
+
+        # Deflate dominates PNG save time; a low level is several times
+        # faster than Pillow's default of 6 for little size increase on
+        # photographic frames
+        pil_image.save(
+            save_path,
+            "PNG",
+            compress_level=self.config.png_compress_level,
+            optimize=False,
+        )
+
     def get_storage_info(self) -> StorageInfo:
         """Get storage usage information.
 
@@ -286,17 +775,17 @@ class ImageStorage:
         try:
             usage = shutil.disk_usage(self.config.base_path)
 
-            # Count images
-            image_count = 0
-            for ext in ("*.fits", "*.png"):
-                image_count += len(list(self.config.base_path.rglob(ext)))
+            # Count images once; saves keep the count current afterwards
+            with self._count_lock:
+                if self._image_count is None:
+                    self._image_count = _count_images(self.config.base_path)
 
             return StorageInfo(
                 base_path=self.config.base_path,
                 total_bytes=usage.total,
                 used_bytes=usage.used,
                 free_bytes=usage.free,
-                image_count=image_count,
+                image_count=self._image_count,
             )
 
         except OSError as e:
@@ -315,18 +804,26 @@ class ImageStorage:
         Returns:
             True if free space is above threshold, False otherwise.
         """
-        info = self.get_storage_info()
+        try:
+            free_bytes = self._free_bytes()
+        except OSError as e:
+            logger.error(f"Error getting storage info: {e}")
+            free_bytes = 0
         threshold_bytes = self.config.min_free_space_mb * 1024 * 1024
 
-        if info.free_bytes < threshold_bytes:
+        if free_bytes < threshold_bytes:
             logger.warning(
-                f"Low disk space: {info.free_mb:.1f}MB free "
+                f"Low disk space: {free_bytes / (1024**2):.1f}MB free "
                 f"(threshold: {self.config.min_free_space_mb}MB)"
             )
             return False
 
         return True
 
+    def _free_bytes(self) -> int:
+        """Get free space on the storage filesystem without counting images."""
+        return shutil.disk_usage(self.config.base_path).free
+
     def list_images(self, year_month: Optional[str] = None) -> list[Path]:
         """List captured images.
 
@@ -343,8 +840,21 @@ class ImageStorage:
         else:
             search_path = self.config.base_path
 
-        images = []
-        for ext in ("*.fits", "*.png"):
-            images.extend(search_path.rglob(ext))
+        # Reuse the last listing while no directory under search_path has
+        # changed; adding or removing an entry updates its parent's mtime
+        cached = self._list_cache.get(search_path)
+        if cached is not None and self._dir_mtimes_unchanged(cached[0]):
+            return list(cached[1])
 
-        return sorted(images)
+        dir_mtimes: dict[str, int] = {}
+        images = sorted(map(Path, _iter_images(search_path, dir_mtimes)))
+        self._list_cache[search_path] = (dir_mtimes, images)
+        return list(images)
+
+    @staticmethod
+    def _dir_mtimes_unchanged(dir_mtimes: dict[str, int]) -> bool:
+        """Check that every recorded directory still has the recorded mtime."""
+        try:
+            return all(os.stat(d).st_mtime_ns == m for d, m in dir_mtimes.items())
+        except OSError:
+            return False
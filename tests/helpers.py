@@ -0,0 +1,23 @@
+"""Shared test data for the analemma test suite."""
+
+import numpy as np
+
+
+def pattern(shape):
+    """Return a deterministic, non-uniform uint8 frame of the given shape."""
+    return (np.arange(np.prod(shape)) % 251).astype(np.uint8).reshape(shape)
+
+
+def _read_only_pattern(shape):
+    """Return a pattern frame that tests can share but not modify."""
+    frame = pattern(shape)
+    frame.flags.writeable = False
+    return frame
+
+
+# Shared read-only frames in camera (height, width, channels) order
+RGB_FRAME = _read_only_pattern((480, 640, 3))
+GRAY_FRAME = _read_only_pattern((480, 640))
+
+# The same size RGB frame in FITS (channels, height, width) order
+RGB_FITS_FRAME = _read_only_pattern((3, 480, 640))
@@ -1,5 +1,6 @@
 """Tests for camera module."""
 
+import time
 from unittest.mock import MagicMock, patch
 
 import numpy as np
@@ -12,6 +13,8 @@ from analemma.camera import (
     CameraInfo,
     CaptureError,
     CaptureResult,
+    debayer,
+    list_cameras,
 )
 from analemma.config import CameraConfig
 
@@ -126,6 +129,43 @@ class TestCameraControllerMocked:
             result = controller.connect()
             assert result is True
 
+    def test_asi_library_loaded_once(self, camera_config, mock_asi):
+        """Test that the SDK library is initialized once and shared."""
+        with patch("analemma.camera.ASI_AVAILABLE", True), patch(
+            "analemma.camera._asi_initialized", False
+        ):
+            CameraController(camera_config).connect()
+            list_cameras()
+            CameraController(camera_config).connect()
+
+            mock_asi.init.assert_called_once()
+
+    def test_asi_library_already_initialized(self, camera_config, mock_asi, mock_camera):
+        """Test that an SDK initialized elsewhere in the process is accepted."""
+
+        class ZWOError(Exception):
+            pass
+
+        mock_asi.ZWO_Error = ZWOError
+        mock_asi.init.side_effect = ZWOError("Library already initialized")
+        with patch("analemma.camera.ASI_AVAILABLE", True), patch(
+            "analemma.camera._asi_initialized", False
+        ):
+            assert CameraController(camera_config).connect() is True
+            mock_asi.init.assert_called_once()
+
+    def test_asi_library_not_found(self, camera_config, mock_asi):
+        """Test error when no SDK library path can be loaded."""
+        mock_asi.ZWO_Error = Exception
+        mock_asi.init.side_effect = OSError("not found")
+        with patch("analemma.camera.ASI_AVAILABLE", True), patch(
+            "analemma.camera._asi_initialized", False
+        ):
+            controller = CameraController(camera_config)
+            with pytest.raises(CameraConnectionError, match="Could not find ASI camera library"):
+                controller.connect()
+            assert list_cameras() == []
+
     def test_connect_no_cameras(self, camera_config, mock_asi):
         """Test connection when no cameras found."""
         mock_asi.get_num_cameras.return_value = 0
@@ -149,6 +189,112 @@ class TestCameraControllerMocked:
             assert result.exposure_us == 1000
             assert result.gain == 0
             assert result.temperature == 25.0  # 250 / 10
+            assert result.timestamp_ns > 0
+            assert abs(result.timestamp - time.time()) < 60
+
+    def test_raw_debayer_uses_cached_pattern(self, mock_asi, mock_camera):
+        """Test that raw debayering doesn't query camera properties per frame."""
+        config = CameraConfig(image_type="raw", debayer_on_capture=True)
+        mock_camera.capture.return_value = np.zeros((976, 1304), dtype=np.uint16)
+        with patch("analemma.camera.ASI_AVAILABLE", True):
+            controller = CameraController(config)
+            controller._initialized = True
+            controller.connect()
+            mock_camera.get_camera_property.reset_mock()
+
+            result = controller.capture()
+            controller.capture()
+
+            assert result.image.shape == (976, 1304, 3)
+            mock_camera.get_camera_property.assert_not_called()
+
+    def test_connect_allocates_frame_buffer(self, camera_config, mock_asi, mock_camera):
+        """Test that connecting allocates a reusable RGB24 frame buffer."""
+        with patch("analemma.camera.ASI_AVAILABLE", True):
+            controller = CameraController(camera_config)
+            controller._initialized = True
+            controller.connect()
+
+            assert isinstance(controller._frame_buffer, bytearray)
+            assert len(controller._frame_buffer) == 1304 * 976 * 3
+
+    def test_capture_reuses_frame_buffer(self, camera_config, mock_asi, mock_camera):
+        """Test that capture passes the preallocated buffer to the driver."""
+        with patch("analemma.camera.ASI_AVAILABLE", True):
+            controller = CameraController(camera_config)
+            controller._initialized = True
+            controller.connect()
+
+            result = controller.capture()
+            mock_camera.capture.assert_called_with(buffer_=controller._frame_buffer)
+            assert result.image is mock_camera.capture.return_value
+
+            copied = controller.capture(copy=True)
+            assert copied.image is not mock_camera.capture.return_value
+            np.testing.assert_array_equal(copied.image, mock_camera.capture.return_value)
+
+    def test_apply_config_skips_unchanged_controls(self, camera_config, mock_asi, mock_camera):
+        """Test that re-applying identical settings makes no control writes."""
+        with patch("analemma.camera.ASI_AVAILABLE", True):
+            controller = CameraController(camera_config)
+            controller._initialized = True
+            controller.connect()
+            mock_camera.set_control_value.reset_mock()
+            mock_camera.set_image_type.reset_mock()
+
+            controller._apply_config()
+            mock_camera.set_control_value.assert_not_called()
+            mock_camera.set_image_type.assert_not_called()
+
+            controller.set_exposure(2000)
+            mock_camera.set_control_value.assert_called_once_with(
+                mock_asi.ASI_EXPOSURE, 2000, auto=False
+            )
+
+    def test_capture_discards_pending_exposure(self, camera_config, mock_asi, mock_camera):
+        """Test that stale exposures are aborted before capturing."""
+        with patch("analemma.camera.ASI_AVAILABLE", True):
+            controller = CameraController(camera_config)
+            controller._initialized = True
+            controller._camera = mock_camera
+
+            controller.capture()
+
+            mock_camera.stop_video_capture.assert_called_once()
+            mock_camera.stop_exposure.assert_called_once()
+
+    def test_capture_skips_discard_after_success(self, camera_config, mock_asi, mock_camera):
+        """Test that completed captures don't abort exposures again."""
+        with patch("analemma.camera.ASI_AVAILABLE", True):
+            controller = CameraController(camera_config)
+            controller._initialized = True
+            controller._camera = mock_camera
+
+            controller.capture()
+            controller.capture()
+
+            mock_camera.stop_video_capture.assert_called_once()
+            mock_camera.stop_exposure.assert_called_once()
+
+    def test_capture_discards_after_failed_attempt(self, camera_config, mock_asi, mock_camera):
+        """Test that a failed capture aborts its exposure before retrying."""
+        mock_asi.ZWO_Error = RuntimeError
+        mock_camera.capture.side_effect = [
+            RuntimeError("Exposure failed"),
+            np.zeros((976, 1304, 3), dtype=np.uint8),
+        ]
+        mock_camera.stop_video_capture.side_effect = RuntimeError("Not capturing")
+
+        with patch("analemma.camera.ASI_AVAILABLE", True), patch("time.sleep"):
+            controller = CameraController(camera_config)
+            controller._initialized = True
+            controller._camera = mock_camera
+
+            controller.capture()
+
+            # Once up front and once before the retry, even though
+            # stop_video_capture raised
+            assert mock_camera.stop_exposure.call_count == 2
 
     def test_capture_retry(self, camera_config, mock_asi, mock_camera):
         """Test capture with retry on failure."""
@@ -168,6 +314,30 @@ class TestCameraControllerMocked:
                 assert result is not None
                 assert mock_camera.capture.call_count == 3
 
+    def test_capture_transient_error_skips_backoff(self, camera_config, mock_asi, mock_camera):
+        """Test that transient errors are retried without exponential backoff."""
+        mock_asi.ZWO_Error = Exception
+        mock_camera.capture.side_effect = [
+            Exception("Timeout"),
+            Exception("Invalid control type"),
+            np.zeros((976, 1304, 3), dtype=np.uint8),
+        ]
+
+        with patch("analemma.camera.ASI_AVAILABLE", True):
+            with patch("time.sleep") as mock_sleep:
+                controller = CameraController(camera_config)
+                controller._initialized = True
+                controller._camera = mock_camera
+
+                controller.capture()
+
+                delays = [c.args[0] for c in mock_sleep.call_args_list]
+                assert delays == [
+                    CameraController.TRANSIENT_RETRY_DELAY,
+                    CameraController.INITIAL_RETRY_DELAY,
+                ]
+                assert controller._transient_retries == 1
+
     def test_capture_all_retries_fail(self, camera_config, mock_asi, mock_camera):
         """Test capture when all retries fail."""
         mock_asi.ZWO_Error = Exception
@@ -195,6 +365,10 @@ class TestCameraControllerMocked:
             assert info.max_width == 1304
             assert info.max_height == 976
             assert info.is_color is True
+            assert info.bayer_pattern == "RGGB"
+
+            mock_camera.get_camera_property.return_value["BayerPattern"] = 7
+            assert controller.get_info().bayer_pattern is None
 
     def test_context_manager(self, camera_config, mock_asi, mock_camera):
         """Test using controller as context manager."""
@@ -219,6 +393,38 @@ class TestCameraControllerMocked:
             assert controller._camera is None
 
 
+class TestDebayer:
+    """Tests for the debayer helper."""
+
+    @pytest.mark.parametrize("pattern", ["RGGB", "BGGR", "GRBG", "GBRG"])
+    def test_uniform_colour_recovered(self, pattern):
+        """Test that a flat-colour mosaic demosaics to the same colour."""
+        values = {"R": 200, "G": 100, "B": 50}
+        raw = np.empty((8, 8), dtype=np.uint16)
+        for index, site in enumerate(pattern):
+            row, col = divmod(index, 2)
+            raw[row::2, col::2] = values[site]
+
+        with patch("analemma.camera.CV2_AVAILABLE", False):
+            rgb = debayer(raw, pattern)
+
+        assert rgb.shape == (8, 8, 3)
+        assert rgb.dtype == np.uint16
+        assert np.all(rgb[..., 0] == 200)
+        assert np.all(rgb[..., 1] == 100)
+        assert np.all(rgb[..., 2] == 50)
+
+    def test_invalid_shape(self):
+        """Test that colour input is rejected."""
+        with pytest.raises(ValueError, match="Expected a 2D Bayer frame"):
+            debayer(np.zeros((4, 4, 3), dtype=np.uint8))
+
+    def test_invalid_pattern(self):
+        """Test that unknown Bayer patterns are rejected."""
+        with pytest.raises(ValueError, match="Unsupported Bayer pattern"):
+            debayer(np.zeros((4, 4), dtype=np.uint8), "XYZW")
+
+
 class TestCaptureResult:
     """Tests for CaptureResult dataclass."""
 
@@ -237,6 +443,26 @@ class TestCaptureResult:
         assert result.width == 640
         assert result.height == 480
 
+    def test_detach_copies_image(self):
+        """Test that detach returns an independent copy of the frame."""
+        buffer = bytearray(4 * 4 * 3)
+        image = np.frombuffer(buffer, dtype=np.uint8).reshape(4, 4, 3)
+        result = CaptureResult(
+            image=image,
+            exposure_us=1000,
+            gain=0,
+            temperature=None,
+            width=4,
+            height=4,
+            timestamp=1234567890.0,
+        )
+
+        detached = result.detach()
+        buffer[:] = b"\xff" * len(buffer)
+
+        assert np.all(result.image == 255)
+        assert np.all(detached == 0)
+
 
 class TestCameraInfo:
     """Tests for CameraInfo dataclass."""
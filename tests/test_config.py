@@ -1,7 +1,10 @@
 """Tests for configuration module."""
 
+import os
 import tempfile
+from datetime import time as dtime
 from pathlib import Path
+from zoneinfo import ZoneInfo
 
 import pytest
 import yaml
@@ -13,6 +16,7 @@ from analemma.config import (
     ScheduleConfig,
     StorageConfig,
     SyncConfig,
+    dump_config,
     load_config,
     save_config,
 )
@@ -59,6 +63,18 @@ class TestScheduleConfig:
             config = ScheduleConfig(capture_time=time)
             assert config.capture_time == time
 
+    def test_parsed_capture_time(self):
+        """Test that hour and minute are exposed as integers."""
+        config = ScheduleConfig(capture_time="11:45")
+        assert config.capture_hour == 11
+        assert config.capture_minute == 45
+
+        assert config.time_of_day == dtime(11, 45)
+
+        config.capture_time = "09:05"
+        assert (config.capture_hour, config.capture_minute) == (9, 5)
+        assert "capture_hour" not in Config(schedule=config).to_dict()["schedule"]
+
     def test_invalid_capture_time_format(self):
         """Test that invalid time format raises error."""
         with pytest.raises(ValueError, match="HH:MM format"):
@@ -69,6 +85,24 @@ class TestScheduleConfig:
         with pytest.raises(ValueError, match="HH:MM format"):
             ScheduleConfig(capture_time="25:00")
 
+    def test_tzinfo_cached(self):
+        """Test that each timezone name is loaded into a ZoneInfo only once."""
+        first = ScheduleConfig(timezone="Asia/Tokyo").tzinfo
+        ZoneInfo.clear_cache()
+
+        assert ScheduleConfig(timezone="Asia/Tokyo").tzinfo is first
+        assert first.key == "Asia/Tokyo"
+
+    def test_capture_time_ignores_surrounding_whitespace(self):
+        """Test that padding and a trailing newline are stripped."""
+        for time, expected in [(" 12:00", dtime(12, 0)), ("9:30\n", dtime(9, 30))]:
+            assert ScheduleConfig(capture_time=time).time_of_day == expected
+
+    def test_capture_time_rejects_loose_formats(self):
+        """Test that signed, spaced or out-of-range times are rejected."""
+        for time in ["+1:00", "12:5", "12 : 00", "1_2:00", "12:60", "24:00", "12:"]:
+            with pytest.raises(ValueError, match="HH:MM format"):
+                ScheduleConfig(capture_time=time)
 
 class TestStorageConfig:
     """Tests for StorageConfig."""
@@ -80,6 +114,21 @@ class TestStorageConfig:
         assert config.monthly_subfolders is True
         assert config.min_free_space_mb == 1024
 
+    def test_invalid_fits_dtype(self):
+        """Test that an unknown FITS pixel type raises error."""
+        with pytest.raises(ValueError, match="fits_dtype"):
+            StorageConfig(fits_dtype="float32")
+
+    def test_invalid_png_compress_level(self):
+        """Test that a PNG compression level outside 0-9 raises error."""
+        with pytest.raises(ValueError, match="png_compress_level"):
+            StorageConfig(png_compress_level=10)
+
+    def test_invalid_composite_png_interval(self):
+        """Test that a negative PNG regeneration interval raises error."""
+        with pytest.raises(ValueError, match="composite_png_stale_after_s"):
+            StorageConfig(composite_png_stale_after_s=-1)
+
     def test_string_path_conversion(self):
         """Test that string paths are converted to Path objects."""
         config = StorageConfig(base_path="/tmp/test")
@@ -140,6 +189,11 @@ class TestSyncConfig:
         assert config.enabled is True
         assert config.remote == "gdrive:analemma"
 
+    def test_invalid_rc_url(self):
+        """Test that a non-HTTP rc_url raises error."""
+        with pytest.raises(ValueError, match="sync.rc_url must be"):
+            SyncConfig(rc_url="localhost:5572")
+
 
 class TestConfig:
     """Tests for main Config class."""
@@ -181,6 +235,16 @@ class TestConfig:
         assert data["camera"]["exposure_us"] == 1000
         assert data["sync"]["enabled"] is False
 
+    def test_to_dict_stringifies_paths(self):
+        """Test that Path fields are exported as strings."""
+        config = Config()
+        data = config.to_dict()
+        assert data["storage"]["base_path"] == "/home/pi/analemma/images"
+        assert data["logging"]["file"] == "/var/log/analemma/capture.log"
+
+        config.logging.file = None
+        assert config.to_dict()["logging"]["file"] is None
+
 
 class TestLoadSaveConfig:
     """Tests for load_config and save_config functions."""
@@ -210,6 +274,13 @@ class TestLoadSaveConfig:
             assert loaded.camera.exposure_us == 5000
             assert loaded.schedule.capture_time == "10:00"
 
+    def test_dump_config_matches_to_dict(self):
+        """Test that direct YAML dumping matches dumping the dict form."""
+        config = Config()
+        dumped = dump_config(config)
+        assert yaml.safe_load(dumped) == config.to_dict()
+        assert "!!python" not in dumped
+
     def test_load_empty_file(self):
         """Test loading empty config file."""
         with tempfile.NamedTemporaryFile(suffix=".yaml", delete=False) as f:
@@ -222,3 +293,89 @@ class TestLoadSaveConfig:
             assert config.camera.exposure_us == 1000
         finally:
             config_path.unlink()
+
+    def test_load_picks_up_file_changes(self):
+        """Test that cached YAML is invalidated when the file changes."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config_path = Path(tmpdir) / "config.yaml"
+            config_path.write_text("camera:\n  exposure_us: 2000\n")
+
+            first = load_config(config_path)
+            second = load_config(config_path)
+            assert first.camera.exposure_us == second.camera.exposure_us == 2000
+            assert first is not second
+
+            config_path.write_text("camera:\n  exposure_us: 3000\n")
+            stat = config_path.stat()
+            os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+            assert load_config(config_path).camera.exposure_us == 3000
+
+    def test_default_path_search(self, monkeypatch):
+        """Test that the first-precedence config path is resolved once and reused."""
+        from analemma import config as config_module
+
+        monkeypatch.setattr(config_module, "_resolved_config_paths", {})
+        with tempfile.TemporaryDirectory() as tmpdir:
+            found = Path(tmpdir) / "config.yaml"
+            found.write_text("camera:\n  gain: 40\n")
+            monkeypatch.setattr(
+                config_module,
+                "_CONFIG_SEARCH_PATHS",
+                (found, Path(tmpdir) / "fallback.yaml"),
+            )
+
+            assert load_config().camera.gain == 40
+            assert config_module._resolve_config_path() == found
+            assert found in config_module._resolved_config_paths.values()
+
+    def test_higher_precedence_config_created_later(self, monkeypatch):
+        """Test that a lower-precedence hit doesn't hide a config created later."""
+        from analemma import config as config_module
+
+        monkeypatch.setattr(config_module, "_resolved_config_paths", {})
+        with tempfile.TemporaryDirectory() as tmpdir:
+            preferred = Path(tmpdir) / "config.yaml"
+            fallback = Path(tmpdir) / "fallback.yaml"
+            fallback.write_text("camera:\n  gain: 30\n")
+            monkeypatch.setattr(
+                config_module, "_CONFIG_SEARCH_PATHS", (preferred, fallback)
+            )
+            assert load_config().camera.gain == 30
+
+            preferred.write_text("camera:\n  gain: 60\n")
+            assert load_config().camera.gain == 60
+
+    def test_default_path_miss_not_cached(self, monkeypatch):
+        """Test that a config created after a failed lookup is found."""
+        from analemma import config as config_module
+
+        monkeypatch.setattr(config_module, "_resolved_config_paths", {})
+        with tempfile.TemporaryDirectory() as tmpdir:
+            created = Path(tmpdir) / "config.yaml"
+            monkeypatch.setattr(config_module, "_CONFIG_SEARCH_PATHS", (created,))
+            assert config_module._resolve_config_path() is None
+
+            created.write_text("camera:\n  gain: 50\n")
+            assert load_config().camera.gain == 50
+
+    def test_relative_default_path_follows_cwd(self, monkeypatch):
+        """Test that the relative search path is resolved per directory."""
+        from analemma import config as config_module
+
+        monkeypatch.setattr(config_module, "_resolved_config_paths", {})
+        monkeypatch.setattr(
+            config_module, "_CONFIG_SEARCH_PATHS", (Path("config/config.yaml"),)
+        )
+        with tempfile.TemporaryDirectory() as first, tempfile.TemporaryDirectory() as second:
+            for root, gain in ((first, 10), (second, 20)):
+                (Path(root) / "config").mkdir()
+                (Path(root) / "config" / "config.yaml").write_text(
+                    f"camera:\n  gain: {gain}\n"
+                )
+
+            monkeypatch.chdir(first)
+            assert load_config().camera.gain == 10
+            assert config_module._resolve_config_path().is_absolute()
+            monkeypatch.chdir(second)
+            assert load_config().camera.gain == 20
@@ -1,8 +1,13 @@
 """Tests for post-processing module."""
 
+import io
+import json
+import os
+import shutil
 import subprocess
-import tempfile
-from pathlib import Path
+import threading
+import time
+import urllib.error
 from unittest.mock import patch
 
 import numpy as np
@@ -12,40 +17,57 @@ from PIL import Image
 
 from analemma.config import SyncConfig
 from analemma.postprocess import (
+    PREFETCH_DEPTH,
     PostProcessError,
+    _build_composite,
+    _prefetch_tiffs,
     batch_convert_fits,
     create_composite,
     fits_to_tiff,
+    lighten_inplace,
     run_post_pipeline,
     sync_to_remote,
+    update_composite,
 )
+from tests.helpers import GRAY_FRAME, RGB_FITS_FRAME, pattern
+
+
+# Every test here writes real image files; select or skip with -m image_io
+pytestmark = pytest.mark.image_io
+
+
+# Scratch FITS files skip header verification and checksums
+_FITS_WRITE_OPTS = {"output_verify": "ignore", "checksum": False, "overwrite": True}
 
 
 @pytest.fixture
-def temp_dir():
-    """Create temporary directory."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        yield Path(tmpdir)
+def temp_dir(tmp_path_factory):
+    """Create a fresh scratch directory for one test."""
+    return tmp_path_factory.mktemp("case")
+
+
+@pytest.fixture(scope="module")
+def fits_templates(tmp_path_factory):
+    """Write the sample FITS files once per module."""
+    template_dir = tmp_path_factory.mktemp("fits_templates")
+    fits.PrimaryHDU(RGB_FITS_FRAME).writeto(template_dir / "rgb.fits", **_FITS_WRITE_OPTS)
+    fits.PrimaryHDU(GRAY_FRAME).writeto(template_dir / "gray.fits", **_FITS_WRITE_OPTS)
+    return template_dir
 
 
 @pytest.fixture
-def sample_fits_path(temp_dir):
-    """Create a sample FITS file with RGB data."""
+def sample_fits_path(temp_dir, fits_templates):
+    """Copy the sample RGB FITS file into the test directory."""
     fits_path = temp_dir / "analemma_20260116_120000.fits"
-    # Create RGB image data (channels, height, width) as FITS stores it
-    data = np.random.randint(0, 255, (3, 480, 640), dtype=np.uint8)
-    hdu = fits.PrimaryHDU(data)
-    hdu.writeto(fits_path)
+    shutil.copyfile(fits_templates / "rgb.fits", fits_path)
     return fits_path
 
 
 @pytest.fixture
-def sample_grayscale_fits_path(temp_dir):
-    """Create a sample grayscale FITS file."""
+def sample_grayscale_fits_path(temp_dir, fits_templates):
+    """Copy the sample grayscale FITS file into the test directory."""
     fits_path = temp_dir / "analemma_20260117_120000.fits"
-    data = np.random.randint(0, 255, (480, 640), dtype=np.uint8)
-    hdu = fits.PrimaryHDU(data)
-    hdu.writeto(fits_path)
+    shutil.copyfile(fits_templates / "gray.fits", fits_path)
     return fits_path
 
 
@@ -54,7 +76,7 @@ def _create_tiff(path, shape=(480, 640, 3), value=None):
     if value is not None:
         data = np.full(shape, value, dtype=np.uint8)
     else:
-        data = np.random.randint(0, 255, shape, dtype=np.uint8)
+        data = pattern(shape)
     if len(shape) == 3:
         img = Image.fromarray(data, mode="RGB")
     else:
@@ -63,6 +85,12 @@ def _create_tiff(path, shape=(480, 640, 3), value=None):
     return data
 
 
+def _folded_frames(composite_path):
+    """Helper to read the frame names recorded in a composite's state file."""
+    state = json.loads(composite_path.with_suffix(".state.json").read_text())
+    return set(state["folded"])
+
+
 class TestFitsToTiff:
     """Tests for fits_to_tiff."""
 
@@ -95,17 +123,29 @@ class TestFitsToTiff:
         # FITS format: (channels, height, width)
         fits_data = np.transpose(data, (2, 0, 1))
         hdu = fits.PrimaryHDU(fits_data)
-        hdu.writeto(fits_path)
+        hdu.writeto(fits_path, **_FITS_WRITE_OPTS)
 
         tiff_path = fits_to_tiff(fits_path)
         img = np.array(Image.open(tiff_path))
         np.testing.assert_array_equal(img, data)
 
+    def test_compressed_fits(self, temp_dir):
+        """Test that image data in a compressed extension is converted."""
+        fits_path = temp_dir / "compressed.fits"
+        data = pattern((3, 8, 10))
+        fits.HDUList(
+            [fits.PrimaryHDU(), fits.CompImageHDU(data, compression_type="RICE_1")]
+        ).writeto(fits_path, **_FITS_WRITE_OPTS)
+
+        tiff_path = fits_to_tiff(fits_path)
+        img = np.array(Image.open(tiff_path))
+        np.testing.assert_array_equal(img, np.transpose(data, (1, 2, 0)))
+
     def test_empty_fits_raises_error(self, temp_dir):
         """Test that FITS with no data raises error."""
         fits_path = temp_dir / "empty.fits"
         hdu = fits.PrimaryHDU()
-        hdu.writeto(fits_path)
+        hdu.writeto(fits_path, **_FITS_WRITE_OPTS)
 
         with pytest.raises(PostProcessError, match="No image data"):
             fits_to_tiff(fits_path)
@@ -124,9 +164,8 @@ class TestBatchConvertFits:
         # Create multiple FITS files
         for i in range(3):
             fits_path = temp_dir / f"analemma_{i:02d}.fits"
-            data = np.random.randint(0, 255, (3, 480, 640), dtype=np.uint8)
-            hdu = fits.PrimaryHDU(data)
-            hdu.writeto(fits_path)
+            hdu = fits.PrimaryHDU(RGB_FITS_FRAME)
+            hdu.writeto(fits_path, **_FITS_WRITE_OPTS)
 
         converted = batch_convert_fits(temp_dir)
         assert len(converted) == 3
@@ -134,6 +173,20 @@ class TestBatchConvertFits:
             assert p.exists()
             assert p.suffix == ".tif"
 
+    def test_in_process_matches_pool(self, temp_dir):
+        """Test that single-process and pooled conversion agree."""
+        for i in range(4):
+            data = np.full((3, 8, 8), i * 40, dtype=np.uint8)
+            fits_path = temp_dir / f"analemma_{i:02d}.fits"
+            fits.PrimaryHDU(data).writeto(fits_path, **_FITS_WRITE_OPTS)
+
+        pooled = batch_convert_fits(temp_dir, workers=2)
+        serial = batch_convert_fits(temp_dir, force=True, workers=1)
+
+        assert sorted(pooled) == sorted(serial)
+        for i, p in enumerate(sorted(serial)):
+            assert np.all(np.array(Image.open(p)) == i * 40)
+
     def test_skips_existing_tiff(self, sample_fits_path, temp_dir):
         """Test that existing TIFFs are skipped."""
         # Create a TIFF for the existing FITS
@@ -160,13 +213,12 @@ class TestBatchConvertFits:
         """Test that batch conversion continues after a failure."""
         # Create one valid and one invalid FITS file
         good_path = temp_dir / "good.fits"
-        data = np.random.randint(0, 255, (3, 480, 640), dtype=np.uint8)
-        hdu = fits.PrimaryHDU(data)
-        hdu.writeto(good_path)
+        hdu = fits.PrimaryHDU(RGB_FITS_FRAME)
+        hdu.writeto(good_path, **_FITS_WRITE_OPTS)
 
         bad_path = temp_dir / "bad.fits"
         hdu = fits.PrimaryHDU()
-        hdu.writeto(bad_path)
+        hdu.writeto(bad_path, **_FITS_WRITE_OPTS)
 
         converted = batch_convert_fits(temp_dir)
         assert len(converted) == 1
@@ -183,6 +235,7 @@ class TestCreateComposite:
         result = create_composite(temp_dir)
         assert result.exists()
         assert result.name == "composite.tif"
+        assert _folded_frames(result) == {"img_0.tif", "img_1.tif", "img_2.tif"}
 
         # PNG copy should also exist
         assert result.with_suffix(".png").exists()
@@ -193,22 +246,48 @@ class TestCreateComposite:
         _create_tiff(temp_dir / "img_a.tif", shape=(2, 2, 3), value=100)
         _create_tiff(temp_dir / "img_b.tif", shape=(2, 2, 3), value=200)
 
-        result = create_composite(temp_dir)
-        composite = np.array(Image.open(result))
+        composite, _ = _build_composite(temp_dir)
 
         # All pixels should be 200 (the maximum)
         assert np.all(composite == 200)
 
+    def test_parallel_blend_matches_maximum(self, temp_dir):
+        """Test that the threaded reduction yields the per-pixel maximum."""
+        frames = [
+            _create_tiff(temp_dir / f"img_{i:02d}.tif", shape=(6, 6, 3))
+            for i in range(9)
+        ]
+        _create_tiff(temp_dir / "img_99.tif", shape=(3, 3, 3), value=255)
+
+        composite, _ = _build_composite(temp_dir)
+
+        np.testing.assert_array_equal(composite, np.maximum.reduce(frames))
+
+    def test_serial_blend_accumulates_into_first_frame(self, temp_dir):
+        """Test that small composites blend in place without a second accumulator."""
+        for name, value in (("img_a", 10), ("img_b", 90), ("img_c", 40)):
+            _create_tiff(temp_dir / f"{name}.tif", shape=(4, 4, 3), value=value)
+
+        with patch(
+            "analemma.postprocess.lighten_inplace", wraps=lighten_inplace
+        ) as mock_lighten:
+            composite, folded = _build_composite(temp_dir)
+
+        assert mock_lighten.call_count == 2
+        assert all(call.args[0] is composite for call in mock_lighten.call_args_list)
+        assert np.all(composite == 90)
+        assert folded == {"img_a.tif", "img_b.tif", "img_c.tif"}
+
     def test_excludes_composite_from_input(self, temp_dir):
         """Test that composite.tif is excluded from input files."""
         _create_tiff(temp_dir / "img_a.tif", shape=(10, 10, 3), value=50)
         _create_tiff(temp_dir / "composite.tif", shape=(10, 10, 3), value=255)
 
-        result = create_composite(temp_dir)
-        composite = np.array(Image.open(result))
+        composite, folded = _build_composite(temp_dir)
 
         # Should only contain values from img_a (50), not the old composite (255)
         assert np.all(composite == 50)
+        assert folded == {"img_a.tif"}
 
     def test_custom_output_path(self, temp_dir):
         """Test composite with custom output path."""
@@ -230,9 +309,19 @@ class TestCreateComposite:
         _create_tiff(temp_dir / "img_b.tif", shape=(20, 20, 3), value=200)
 
         # Should not raise, just skip the mismatched image
-        result = create_composite(temp_dir)
-        composite = np.array(Image.open(result))
+        composite, folded = _build_composite(temp_dir)
         assert composite.shape == (10, 10, 3)
+        assert folded == {"img_a.tif"}
+
+    def test_skips_unreadable_tiff(self, temp_dir):
+        """Test that a corrupt TIFF is skipped without aborting the blend."""
+        _create_tiff(temp_dir / "img_a.tif", shape=(10, 10, 3), value=50)
+        (temp_dir / "img_b.tif").write_bytes(b"not a tiff")
+        _create_tiff(temp_dir / "img_c.tif", shape=(10, 10, 3), value=120)
+
+        composite, folded = _build_composite(temp_dir)
+        assert np.all(composite == 120)
+        assert folded == {"img_a.tif", "img_c.tif"}
 
     def test_handles_subfolders(self, temp_dir):
         """Test composite with TIFF files in subfolders."""
@@ -241,25 +330,278 @@ class TestCreateComposite:
         _create_tiff(subfolder / "img_a.tif", shape=(10, 10, 3), value=100)
         _create_tiff(temp_dir / "img_b.tif", shape=(10, 10, 3), value=150)
 
-        result = create_composite(temp_dir)
-        composite = np.array(Image.open(result))
+        composite, folded = _build_composite(temp_dir)
         assert np.all(composite == 150)
+        assert folded == {"img_a.tif", "img_b.tif"}
+
+
+class TestLightenInplace:
+    """Tests for lighten_inplace."""
+
+    @pytest.mark.parametrize("shape", [(6, 8, 3), (6, 8)])
+    def test_matches_numpy_maximum(self, shape):
+        """Test that the blend equals the per-pixel maximum."""
+        rng = np.random.default_rng(0)
+        dst = rng.integers(0, 256, shape, dtype=np.uint8)
+        src = rng.integers(0, 256, shape, dtype=np.uint8)
+        expected = np.maximum(dst, src)
+
+        lighten_inplace(dst, src)
+
+        np.testing.assert_array_equal(dst, expected)
+
+    def test_non_contiguous_input(self):
+        """Test that strided views fall back to np.maximum."""
+        dst = np.zeros((4, 4), dtype=np.uint8)
+        src = np.full((4, 8), 7, dtype=np.uint8)[:, ::2]
+
+        lighten_inplace(dst, src)
+
+        assert np.all(dst == 7)
+
+
+class TestPrefetchTiffs:
+    """Tests for _prefetch_tiffs."""
+
+    def test_decodes_into_reused_buffers(self, temp_dir):
+        """Test that frames of a known shape cycle through a buffer ring."""
+        pytest.importorskip("tifffile")
+        paths = []
+        for i in range(10):
+            paths.append(temp_dir / f"img_{i:02d}.tif")
+            # Compressed, so frames are decoded rather than memory-mapped
+            Image.fromarray(np.full((4, 4, 3), i, dtype=np.uint8)).save(
+                paths[-1], compression="tiff_deflate"
+            )
+
+        buffers = set()
+        for i, (path, img) in enumerate(_prefetch_tiffs(paths, (4, 4, 3))):
+            assert np.all(img == i)
+            buffers.add(id(img))
+
+        assert len(buffers) <= PREFETCH_DEPTH + 2
+
+    def test_uncompressed_frames_memory_mapped(self, temp_dir):
+        """Test that uncompressed TIFFs are mapped instead of decoded."""
+        pytest.importorskip("tifffile")
+        _create_tiff(temp_dir / "img_a.tif", shape=(4, 4, 3), value=70)
+
+        [(_, img)] = list(_prefetch_tiffs([temp_dir / "img_a.tif"], (4, 4, 3)))
+        assert isinstance(img, np.memmap)
+        assert np.all(img == 70)
+
+    @pytest.mark.parametrize("compression", [None, "tiff_deflate"])
+    def test_early_close_stops_producer(self, temp_dir, compression):
+        """Test that closing the generator early ends the background thread."""
+        paths = []
+        for i in range(8):
+            paths.append(temp_dir / f"img_{i:02d}.tif")
+            Image.fromarray(np.full((4, 4, 3), i, dtype=np.uint8)).save(
+                paths[-1], compression=compression
+            )
+
+        threads_before = threading.active_count()
+        frames = _prefetch_tiffs(paths, (4, 4, 3))
+        next(frames)
+        time.sleep(0.05)  # Let the producer fill the queue and block
+        frames.close()
+
+        assert threading.active_count() == threads_before
+
+    def test_mismatched_shape_decoded_separately(self, temp_dir):
+        """Test that a frame not fitting the ring is still decoded."""
+        _create_tiff(temp_dir / "img_a.tif", shape=(4, 4, 3), value=10)
+        _create_tiff(temp_dir / "img_b.tif", shape=(2, 2, 3), value=20)
+
+        items = [
+            (p.name, img.shape)
+            for p, img in _prefetch_tiffs(
+                [temp_dir / "img_a.tif", temp_dir / "img_b.tif"], (4, 4, 3)
+            )
+        ]
+        assert items == [("img_a.tif", (4, 4, 3)), ("img_b.tif", (2, 2, 3))]
+
+
+class TestUpdateComposite:
+    """Tests for update_composite."""
+
+    def test_creates_composite_from_first_frame(self, temp_dir):
+        """Test that a missing composite is seeded from the new frame."""
+        data = _create_tiff(temp_dir / "img_a.tif", shape=(4, 4, 3), value=80)
+        composite_path = temp_dir / "composite.tif"
+
+        update_composite(composite_path, temp_dir / "img_a.tif")
+
+        np.testing.assert_array_equal(np.array(Image.open(composite_path)), data)
+        assert composite_path.with_suffix(".png").exists()
+
+    def test_lightens_new_frame_into_composite(self, temp_dir):
+        """Test that a new frame is lighten-blended into the composite."""
+        _create_tiff(temp_dir / "img_a.tif", shape=(4, 4, 3), value=80)
+        _create_tiff(temp_dir / "img_b.tif", shape=(4, 4, 3), value=160)
+        composite_path = create_composite(temp_dir)
+
+        _create_tiff(temp_dir / "img_c.tif", shape=(4, 4, 3), value=240)
+        update_composite(composite_path, temp_dir / "img_c.tif")
+
+        assert np.all(np.array(Image.open(composite_path)) == 240)
+
+    def test_skips_already_folded_frame(self, temp_dir):
+        """Test that frames recorded in the state file are not re-read."""
+        _create_tiff(temp_dir / "img_a.tif", shape=(4, 4, 3), value=80)
+        composite_path = create_composite(temp_dir)
+
+        # Overwrite the source; an already-folded frame must be ignored
+        _create_tiff(temp_dir / "img_a.tif", shape=(4, 4, 3), value=200)
+        update_composite(composite_path, temp_dir / "img_a.tif")
+
+        assert np.all(np.array(Image.open(composite_path)) == 80)
+
+    def test_folds_frames_converted_outside_pipeline(self, temp_dir):
+        """Test that TIFFs missing from the state file are blended in too."""
+        _create_tiff(temp_dir / "img_a.tif", shape=(4, 4, 3), value=80)
+        composite_path = create_composite(temp_dir)
+
+        # Converted by hand, never passed to update_composite
+        subfolder = temp_dir / "2026-01"
+        subfolder.mkdir()
+        _create_tiff(subfolder / "img_b.tif", shape=(4, 4, 3), value=250)
+        _create_tiff(temp_dir / "img_c.tif", shape=(4, 4, 3), value=120)
+        update_composite(composite_path, temp_dir / "img_c.tif")
+
+        assert np.all(np.array(Image.open(composite_path)) == 250)
+        assert _folded_frames(composite_path) == {"img_a.tif", "img_b.tif", "img_c.tif"}
+
+    def test_missing_composite_with_state_raises_error(self, temp_dir):
+        """Test that a deleted composite is not re-seeded from one frame."""
+        _create_tiff(temp_dir / "img_a.tif", shape=(4, 4, 3), value=80)
+        composite_path = create_composite(temp_dir)
+        composite_path.unlink()
+
+        with pytest.raises(PostProcessError, match="is missing"):
+            update_composite(
+                composite_path,
+                temp_dir / "img_b.tif",
+                image=np.full((4, 4, 3), 10, dtype=np.uint8),
+            )
+
+    def test_uses_in_memory_image(self, temp_dir):
+        """Test that a supplied array is used instead of decoding the TIFF."""
+        composite_path = temp_dir / "composite.tif"
+        image = np.full((4, 4, 3), 90, dtype=np.uint8)
+
+        update_composite(composite_path, temp_dir / "not_written.tif", image=image)
+
+        assert np.all(np.array(Image.open(composite_path)) == 90)
+
+    def test_reuses_composite_array(self, temp_dir):
+        """Test that the composite is not re-decoded between updates."""
+        composite_path = temp_dir / "composite.tif"
+        update_composite(
+            composite_path, temp_dir / "a.tif", image=np.full((4, 4), 10, dtype=np.uint8)
+        )
+
+        with patch("analemma.postprocess.Image.open", wraps=Image.open) as mock_open:
+            update_composite(
+                composite_path, temp_dir / "b.tif", image=np.full((4, 4), 30, dtype=np.uint8)
+            )
+            mock_open.assert_not_called()
+
+        assert np.all(np.array(Image.open(composite_path)) == 30)
+
+    def test_reloads_externally_modified_composite(self, temp_dir):
+        """Test that a composite rewritten on disk invalidates the cache."""
+        composite_path = temp_dir / "composite.tif"
+        update_composite(
+            composite_path, temp_dir / "a.tif", image=np.full((4, 4), 10, dtype=np.uint8)
+        )
+
+        # Rebuild the composite outside of update_composite
+        Image.fromarray(np.full((4, 4), 200, dtype=np.uint8), mode="L").save(composite_path)
+        stat = composite_path.stat()
+        os.utime(composite_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        update_composite(
+            composite_path, temp_dir / "b.tif", image=np.full((4, 4), 30, dtype=np.uint8)
+        )
+        assert np.all(np.array(Image.open(composite_path)) == 200)
+
+    def test_blends_in_strips(self, temp_dir):
+        """Test that strips of any height cover the whole frame."""
+        composite_path = temp_dir / "composite.tif"
+        base = np.zeros((7, 5, 3), dtype=np.uint8)
+        frame = np.arange(7 * 5 * 3, dtype=np.uint8).reshape(7, 5, 3)
+        update_composite(composite_path, temp_dir / "a.tif", image=base)
+
+        update_composite(composite_path, temp_dir / "b.tif", image=frame, strip_rows=3)
+
+        np.testing.assert_array_equal(np.array(Image.open(composite_path)), frame)
+        np.testing.assert_array_equal(np.load(temp_dir / "composite.npy"), frame)
+
+    def test_rebuild_discards_stale_composite_array(self, temp_dir):
+        """Test that a full rebuild does not reuse the old working array."""
+        composite_path = temp_dir / "composite.tif"
+        update_composite(
+            composite_path, temp_dir / "a.tif", image=np.full((4, 4), 250, dtype=np.uint8)
+        )
+        _create_tiff(temp_dir / "img_a.tif", shape=(4, 4), value=20)
+        create_composite(temp_dir)
+
+        update_composite(
+            composite_path, temp_dir / "b.tif", image=np.full((4, 4), 30, dtype=np.uint8)
+        )
+        assert np.all(np.array(Image.open(composite_path)) == 30)
+
+    def test_png_copy_skipped_while_fresh(self, temp_dir):
+        """Test that a recent PNG copy is not re-encoded."""
+        composite_path = temp_dir / "composite.tif"
+        png_path = composite_path.with_suffix(".png")
+        update_composite(
+            composite_path, temp_dir / "a.tif", image=np.full((4, 4), 10, dtype=np.uint8)
+        )
+        png_mtime = png_path.stat().st_mtime_ns
+
+        update_composite(
+            composite_path,
+            temp_dir / "b.tif",
+            image=np.full((4, 4), 30, dtype=np.uint8),
+            png_stale_after_s=3600,
+        )
+
+        assert png_path.stat().st_mtime_ns == png_mtime
+        assert np.all(np.array(Image.open(png_path)) == 10)
+        assert np.all(np.array(Image.open(composite_path)) == 30)
+
+    def test_shape_mismatch_raises_error(self, temp_dir):
+        """Test that a frame with a different shape is rejected."""
+        _create_tiff(temp_dir / "img_a.tif", shape=(4, 4, 3), value=80)
+        composite_path = create_composite(temp_dir)
+        _create_tiff(temp_dir / "img_b.tif", shape=(8, 8, 3), value=200)
+
+        with pytest.raises(PostProcessError, match="does not match composite"):
+            update_composite(composite_path, temp_dir / "img_b.tif")
 
 
 class TestSyncToRemote:
     """Tests for sync_to_remote."""
 
-    def test_disabled_sync(self, temp_dir):
+    @pytest.fixture(autouse=True)
+    def mock_run(self):
+        """Replace rclone with a mock that succeeds unless a test overrides it."""
+        with patch("analemma.postprocess.subprocess.run") as mock_run:
+            mock_run.return_value = subprocess.CompletedProcess(
+                args=[], returncode=0, stdout="", stderr=""
+            )
+            yield mock_run
+
+    def test_disabled_sync(self, mock_run, temp_dir):
         """Test that disabled sync returns True without running."""
         config = SyncConfig(enabled=False)
         assert sync_to_remote(temp_dir, config) is True
+        mock_run.assert_not_called()
 
-    @patch("analemma.postprocess.subprocess.run")
     def test_successful_sync(self, mock_run, temp_dir):
         """Test successful rclone sync."""
-        mock_run.return_value = subprocess.CompletedProcess(
-            args=[], returncode=0, stdout="", stderr=""
-        )
         config = SyncConfig(enabled=True, remote="gdrive:analemma", files="tiff")
 
         assert sync_to_remote(temp_dir, config) is True
@@ -272,12 +614,8 @@ class TestSyncToRemote:
         assert "--include" in call_args
         assert "*.tif" in call_args
 
-    @patch("analemma.postprocess.subprocess.run")
     def test_sync_composite_only(self, mock_run, temp_dir):
         """Test sync with composite-only filter."""
-        mock_run.return_value = subprocess.CompletedProcess(
-            args=[], returncode=0, stdout="", stderr=""
-        )
         config = SyncConfig(enabled=True, remote="gdrive:analemma", files="composite")
 
         sync_to_remote(temp_dir, config)
@@ -286,12 +624,8 @@ class TestSyncToRemote:
         assert "--include" in call_args
         assert "composite.*" in call_args
 
-    @patch("analemma.postprocess.subprocess.run")
     def test_sync_all_no_filter(self, mock_run, temp_dir):
         """Test sync with 'all' has no include filter."""
-        mock_run.return_value = subprocess.CompletedProcess(
-            args=[], returncode=0, stdout="", stderr=""
-        )
         config = SyncConfig(enabled=True, remote="gdrive:analemma", files="all")
 
         sync_to_remote(temp_dir, config)
@@ -299,7 +633,18 @@ class TestSyncToRemote:
         call_args = mock_run.call_args[0][0]
         assert "--include" not in call_args
 
-    @patch("analemma.postprocess.subprocess.run")
+    def test_sync_discards_stdout(self, mock_run, temp_dir):
+        """Test that rclone stdout is discarded and only stderr is captured."""
+        config = SyncConfig(enabled=True, remote="gdrive:analemma")
+
+        with patch("analemma.postprocess.logger.isEnabledFor", return_value=False):
+            sync_to_remote(temp_dir, config)
+
+        kwargs = mock_run.call_args[1]
+        assert kwargs["stdout"] is subprocess.DEVNULL
+        assert kwargs["stderr"] is subprocess.PIPE
+        assert "--verbose" not in mock_run.call_args[0][0]
+
     def test_sync_failure(self, mock_run, temp_dir):
         """Test handling of rclone failure."""
         mock_run.return_value = subprocess.CompletedProcess(
@@ -309,23 +654,78 @@ class TestSyncToRemote:
 
         assert sync_to_remote(temp_dir, config) is False
 
-    @patch("analemma.postprocess.subprocess.run", side_effect=FileNotFoundError)
     def test_rclone_not_found(self, mock_run, temp_dir):
         """Test handling when rclone is not installed."""
+        mock_run.side_effect = FileNotFoundError
         config = SyncConfig(enabled=True, remote="gdrive:analemma")
 
         assert sync_to_remote(temp_dir, config) is False
 
-    @patch(
-        "analemma.postprocess.subprocess.run",
-        side_effect=subprocess.TimeoutExpired(cmd="rclone", timeout=300),
-    )
     def test_sync_timeout(self, mock_run, temp_dir):
         """Test handling of sync timeout."""
+        mock_run.side_effect = subprocess.TimeoutExpired(cmd="rclone", timeout=300)
         config = SyncConfig(enabled=True, remote="gdrive:analemma")
 
         assert sync_to_remote(temp_dir, config) is False
 
+    def test_rc_daemon_used_when_configured(self, mock_run, temp_dir):
+        """Test that a configured rc daemon receives the copy instead of the CLI."""
+        config = SyncConfig(
+            enabled=True,
+            remote="gdrive:analemma",
+            files="composite",
+            rc_url="http://localhost:5572/",
+        )
+
+        with patch("analemma.postprocess.urllib.request.urlopen") as mock_urlopen:
+            assert sync_to_remote(temp_dir, config) is True
+
+        request = mock_urlopen.call_args[0][0]
+        assert request.full_url == "http://localhost:5572/sync/copy"
+        assert json.loads(request.data) == {
+            "srcFs": str(temp_dir),
+            "dstFs": "gdrive:analemma",
+            "_filter": {
+                "ExcludeRule": ["composite.npy"],
+                "IncludeRule": ["composite.*"],
+            },
+        }
+        mock_run.assert_not_called()
+
+    def test_rc_daemon_error(self, mock_run, temp_dir):
+        """Test that an error reported by the rc daemon fails the sync."""
+        config = SyncConfig(
+            enabled=True, remote="gdrive:analemma", rc_url="http://localhost:5572"
+        )
+        error = urllib.error.HTTPError(
+            "http://localhost:5572/sync/copy",
+            500,
+            "Internal Server Error",
+            {},
+            io.BytesIO(b'{"error": "directory not found"}'),
+        )
+
+        with patch(
+            "analemma.postprocess.urllib.request.urlopen", side_effect=error
+        ):
+            assert sync_to_remote(temp_dir, config) is False
+
+        mock_run.assert_not_called()
+
+    def test_rc_daemon_unreachable_falls_back_to_cli(self, mock_run, temp_dir):
+        """Test that the rclone CLI is used when the rc daemon is down."""
+        config = SyncConfig(
+            enabled=True, remote="gdrive:analemma", rc_url="http://localhost:5572"
+        )
+
+        with patch(
+            "analemma.postprocess.urllib.request.urlopen",
+            side_effect=urllib.error.URLError(ConnectionRefusedError()),
+        ):
+            assert sync_to_remote(temp_dir, config) is True
+
+        mock_run.assert_called_once()
+
 
 class TestRunPostPipeline:
     """Tests for run_post_pipeline."""
@@ -339,6 +739,38 @@ class TestRunPostPipeline:
         # Composite should be created
         assert (temp_dir / "composite.tif").exists()
 
+    def test_pipeline_updates_composite_incrementally(self, temp_dir):
+        """Test that later captures are folded into the existing composite."""
+        for day, value in ((16, 100), (17, 50)):
+            fits_path = temp_dir / f"analemma_202601{day}_120000.fits"
+            data = np.full((3, 4, 4), value, dtype=np.uint8)
+            fits.PrimaryHDU(data).writeto(fits_path, **_FITS_WRITE_OPTS)
+
+            with patch(
+                "analemma.postprocess.create_composite", wraps=create_composite
+            ) as mock_create:
+                run_post_pipeline(fits_path, temp_dir)
+
+            # Only the first run has no composite state and needs a full rebuild
+            assert mock_create.called == (day == 16)
+
+        composite = np.array(Image.open(temp_dir / "composite.tif"))
+        assert np.all(composite == 100)
+
+    @pytest.mark.parametrize("artifact", ["composite.tif", "composite.npy"])
+    def test_pipeline_rebuilds_deleted_composite(self, temp_dir, artifact):
+        """Test that a deleted composite artifact doesn't lose earlier frames."""
+        for day, value in ((16, 100), (17, 50), (18, 20)):
+            fits_path = temp_dir / f"analemma_202601{day}_120000.fits"
+            data = np.full((3, 4, 4), value, dtype=np.uint8)
+            fits.PrimaryHDU(data).writeto(fits_path, **_FITS_WRITE_OPTS)
+            (temp_dir / artifact).unlink(missing_ok=True)
+            run_post_pipeline(fits_path, temp_dir)
+
+        composite = np.array(Image.open(temp_dir / "composite.tif"))
+        assert np.all(composite == 100)
+        assert len(_folded_frames(temp_dir / "composite.tif")) == 3
+
     def test_pipeline_continues_on_tiff_failure(self, temp_dir):
         """Test that pipeline continues even if TIFF conversion fails."""
         # Create a valid TIFF so composite can succeed
@@ -32,6 +32,14 @@ class TestCaptureScheduler:
         assert scheduler._capture_hour == 12
         assert scheduler._capture_minute == 0
 
+    def test_trigger_built_at_init(self, schedule_config, mock_callback):
+        """Test that the cron trigger is prepared before the scheduler starts."""
+        scheduler = CaptureScheduler(schedule_config, mock_callback)
+        now = datetime(2026, 1, 16, 9, 0, tzinfo=ZoneInfo("Asia/Tokyo"))
+
+        next_fire = scheduler._trigger.get_next_fire_time(None, now)
+        assert (next_fire.hour, next_fire.minute) == (12, 0)
+
     def test_init_invalid_time_format(self, mock_callback):
         """Test scheduler initialization with invalid time format."""
         config = ScheduleConfig.__new__(ScheduleConfig)
@@ -62,6 +70,19 @@ class TestCaptureScheduler:
         scheduler.stop()
         assert not scheduler.is_running()
 
+    def test_daily_job_coalesces_missed_runs(self, schedule_config, mock_callback):
+        """Test that missed runs collapse into one capture on a single worker."""
+        scheduler = CaptureScheduler(schedule_config, mock_callback)
+        scheduler.start()
+
+        try:
+            job = scheduler._scheduler.get_job(scheduler._job_id)
+            assert job.coalesce is True
+            assert job.misfire_grace_time == CaptureScheduler.MISFIRE_GRACE_TIME_S
+            assert job.max_instances == 1
+        finally:
+            scheduler.stop()
+
     def test_get_next_capture_time(self, schedule_config, mock_callback):
         """Test getting next capture time."""
         scheduler = CaptureScheduler(schedule_config, mock_callback)
@@ -1,9 +1,12 @@
 """Tests for storage module."""
 
 import json
-import tempfile
+import os
+import shutil
+from dataclasses import replace
 from datetime import datetime
 from pathlib import Path
+from unittest.mock import MagicMock, patch
 from zoneinfo import ZoneInfo
 
 import numpy as np
@@ -11,14 +14,24 @@ import pytest
 from astropy.io import fits
 
 from analemma.config import StorageConfig
-from analemma.storage import CaptureMetadata, ImageStorage, StorageError
+from analemma.storage import (
+    CaptureMetadata,
+    ImageStorage,
+    StorageError,
+    _as_uint8,
+    _to_uint8,
+)
+from tests.helpers import GRAY_FRAME, RGB_FRAME
+
+
+# Every test here writes real image files; select or skip with -m image_io
+pytestmark = pytest.mark.image_io
 
 
 @pytest.fixture
-def temp_storage_dir():
-    """Create temporary storage directory."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        yield Path(tmpdir)
+def temp_storage_dir(tmp_path_factory):
+    """Create a fresh storage directory for one test."""
+    return tmp_path_factory.mktemp("storage")
 
 
 @pytest.fixture
@@ -34,7 +47,7 @@ def storage_config(temp_storage_dir):
 @pytest.fixture
 def sample_image():
     """Create sample RGB image."""
-    return np.random.randint(0, 255, (480, 640, 3), dtype=np.uint8)
+    return RGB_FRAME
 
 
 @pytest.fixture
@@ -64,6 +77,19 @@ class TestCaptureMetadata:
         assert header["GAIN"] == 0
         assert header["CCD-TEMP"] == 25.5
 
+    def test_fits_header_cached(self, sample_metadata):
+        """Test that the FITS header is built once and omits empty values."""
+        metadata = replace(sample_metadata, temperature=None)
+        assert metadata.fits_header is metadata.fits_header
+        assert "CCD-TEMP" not in metadata.fits_header
+        assert metadata.fits_header["EXPTIME"] == 0.001
+
+    def test_fits_cards_carry_comments(self, sample_metadata):
+        """Test that FITS cards pair each header value with a comment."""
+        cards = {key: (value, comment) for key, value, comment in sample_metadata.fits_cards}
+        assert cards["EXPTIME"] == (0.001, "[s] Exposure time")
+        assert cards.keys() == sample_metadata.fits_header.keys()
+
     def test_to_dict(self, sample_metadata):
         """Test dictionary conversion."""
         data = sample_metadata.to_dict()
@@ -98,6 +124,53 @@ class TestImageStorage:
             header = hdul[0].header
             assert header["INSTRUME"] == "ZWO ASI224MC"
             assert header["EXPTIME"] == 0.001
+            assert header.comments["CCD-TEMP"] == "[C] Sensor temperature"
+
+    def test_save_fits_overwrites_without_temp_file(
+        self, storage_config, sample_image, sample_metadata
+    ):
+        """Test that re-saving a FITS replaces it and leaves no temp file."""
+        storage = ImageStorage(storage_config)
+        storage.save(sample_image, sample_metadata, image_type="fits")
+        path = storage.save(sample_image, sample_metadata, image_type="fits")
+
+        assert path.exists()
+        assert list(path.parent.glob("*.tmp")) == []
+        with fits.open(path) as hdul:
+            assert hdul[0].data.shape == (3, *sample_image.shape[:2])
+
+    def test_failed_fits_save_removes_temp_file(
+        self, storage_config, sample_image, sample_metadata
+    ):
+        """Test that a failed write or rename doesn't leave a temp file behind."""
+        storage = ImageStorage(storage_config)
+        with patch("analemma.storage.os.replace", side_effect=OSError("disk full")):
+            with pytest.raises(StorageError, match="Failed to save FITS image"):
+                storage.save(sample_image, sample_metadata, image_type="fits")
+
+        assert list(storage_config.base_path.rglob("*.tmp")) == []
+
+    def test_save_fits_color_planes(self, storage_config, sample_image, sample_metadata):
+        """Test that colour FITS data is stored as (channels, height, width)."""
+        storage = ImageStorage(storage_config)
+        path = storage.save(sample_image, sample_metadata, image_type="fits")
+
+        with fits.open(path) as hdul:
+            np.testing.assert_array_equal(
+                hdul[0].data, np.transpose(sample_image, (2, 0, 1))
+            )
+
+    def test_planar_buffer_reused(self, storage_config, sample_image, sample_metadata):
+        """Test that colour FITS saves reuse one (C, H, W) scratch buffer."""
+        storage = ImageStorage(storage_config)
+        storage.save(sample_image, sample_metadata, image_type="fits")
+        buffer = storage._local.chw_buffer
+
+        storage.save(sample_image[::-1], sample_metadata, image_type="fits")
+        assert storage._local.chw_buffer is buffer
+        np.testing.assert_array_equal(
+            buffer, np.transpose(sample_image[::-1], (2, 0, 1))
+        )
 
     def test_save_png(self, storage_config, sample_image, sample_metadata):
         """Test saving PNG image with JSON metadata."""
@@ -115,6 +188,41 @@ class TestImageStorage:
             metadata = json.load(f)
             assert metadata["camera"]["model"] == "ZWO ASI224MC"
 
+    def test_save_png_numpy_metadata(self, storage_config, sample_image, sample_metadata):
+        """Test that numpy scalars from the camera serialize in the JSON sidecar."""
+        metadata = replace(
+            sample_metadata, temperature=np.float32(21.5), width=np.int64(640)
+        )
+        storage = ImageStorage(storage_config)
+        path = storage.save(sample_image, metadata, image_type="png")
+
+        sidecar = json.loads(path.with_suffix(".json").read_text())
+        assert sidecar["camera"]["temperature"] == 21.5
+        assert sidecar["image"]["width"] == 640
+
+    def test_save_async(self, storage_config, sample_image, sample_metadata):
+        """Test background save returns the path and snapshots the image."""
+        storage = ImageStorage(storage_config)
+        image = sample_image.copy()
+
+        future = storage.save_async(image, sample_metadata, image_type="fits")
+        image[:] = 0  # Caller reuses its buffer immediately
+        path = future.result(timeout=10)
+        storage.close()
+
+        with fits.open(path) as hdul:
+            np.testing.assert_array_equal(
+                hdul[0].data, np.transpose(sample_image, (2, 0, 1))
+            )
+
+    def test_save_async_unsupported_type(
+        self, storage_config, sample_image, sample_metadata
+    ):
+        """Test that an unsupported type is rejected before queueing."""
+        storage = ImageStorage(storage_config)
+        with pytest.raises(StorageError):
+            storage.save_async(sample_image, sample_metadata, image_type="jpeg")
+
     def test_monthly_subfolders(self, storage_config, sample_image, sample_metadata):
         """Test monthly subfolder creation."""
         storage = ImageStorage(storage_config)
@@ -124,6 +232,29 @@ class TestImageStorage:
         assert "2026-01" in str(path)
         assert (storage_config.base_path / "2026-01").exists()
 
+    def test_month_folder_created_once(
+        self, storage_config, sample_image, sample_metadata
+    ):
+        """Test that the month folder is only created on its first save."""
+        storage = ImageStorage(storage_config)
+        with patch.object(Path, "mkdir", autospec=True, side_effect=Path.mkdir) as mkdir:
+            storage.save(sample_image, sample_metadata, image_type="png")
+            storage.save(sample_image, sample_metadata, image_type="png")
+
+        assert mkdir.call_count == 1
+
+    @pytest.mark.parametrize("image_type", ["fits", "png"])
+    def test_month_folder_recreated_after_removal(
+        self, storage_config, sample_image, sample_metadata, image_type
+    ):
+        """Test that a month folder deleted externally is recreated on save."""
+        storage = ImageStorage(storage_config)
+        first = storage.save(sample_image, sample_metadata, image_type=image_type)
+        shutil.rmtree(first.parent)
+
+        path = storage.save(sample_image, sample_metadata, image_type=image_type)
+        assert path.exists()
+
     def test_no_monthly_subfolders(self, temp_storage_dir, sample_image, sample_metadata):
         """Test saving without monthly subfolders."""
         config = StorageConfig(
@@ -152,12 +283,35 @@ class TestImageStorage:
         assert info.free_bytes > 0
         assert info.image_count == 0
 
+    def test_image_count_tracks_saves(self, storage_config, sample_image, sample_metadata):
+        """Test that the cached image count follows new saves."""
+        storage = ImageStorage(storage_config)
+        storage.save(sample_image, sample_metadata, image_type="fits")
+        assert storage.get_storage_info().image_count == 1
+
+        storage.save(sample_image, sample_metadata, image_type="png")
+        storage.save(sample_image, sample_metadata, image_type="png")  # overwrite
+        assert storage.get_storage_info().image_count == 2
+
     def test_check_capacity(self, storage_config):
         """Test capacity check."""
         storage = ImageStorage(storage_config)
         # With 1MB threshold, should pass on any modern system
         assert storage.check_capacity() is True
 
+    def test_check_capacity_does_not_count_images(self, storage_config):
+        """Test that the capacity check only queries free space."""
+        storage = ImageStorage(storage_config)
+        with patch("analemma.storage._count_images") as mock_count:
+            assert storage.check_capacity() is True
+            mock_count.assert_not_called()
+
+    def test_check_capacity_low_space(self, storage_config):
+        """Test that free space below the threshold fails the check."""
+        storage = ImageStorage(storage_config)
+        with patch.object(storage, "_free_bytes", return_value=512 * 1024):
+            assert storage.check_capacity() is False
+
     def test_list_images(self, storage_config, sample_image, sample_metadata):
         """Test listing images."""
         storage = ImageStorage(storage_config)
@@ -169,6 +323,22 @@ class TestImageStorage:
         images = storage.list_images()
         assert len(images) == 2
 
+    def test_list_images_cached_until_tree_changes(
+        self, storage_config, sample_image, sample_metadata
+    ):
+        """Test that listings are reused until a directory changes."""
+        storage = ImageStorage(storage_config)
+        storage.save(sample_image, sample_metadata, image_type="fits")
+        assert len(storage.list_images()) == 1
+
+        with patch("analemma.storage.os.scandir") as mock_scandir:
+            assert len(storage.list_images()) == 1
+            mock_scandir.assert_not_called()
+
+        february = replace(sample_metadata, capture_time="2026-02-16T12:00:00+09:00")
+        storage.save(sample_image, february, image_type="fits")
+        assert len(storage.list_images()) == 2
+
     def test_list_images_filtered(self, storage_config, sample_image, sample_metadata):
         """Test listing images with month filter."""
         storage = ImageStorage(storage_config)
@@ -182,20 +352,361 @@ class TestImageStorage:
         images = storage.list_images(year_month="2026-02")
         assert len(images) == 0
 
+    def test_list_images_filtered_scans_only_month(
+        self, storage_config, sample_image, sample_metadata
+    ):
+        """Test that a month filter walks only that month's directory."""
+        storage = ImageStorage(storage_config)
+        storage.save(sample_image, sample_metadata, image_type="fits")
+        february = replace(sample_metadata, capture_time="2026-02-16T12:00:00+09:00")
+        storage.save(sample_image, february, image_type="png")
+
+        with patch("analemma.storage.os.scandir", wraps=os.scandir) as mock_scandir:
+            images = storage.list_images(year_month="2026-02")
+
+        assert [p.suffix for p in images] == [".png"]
+        scanned = [call.args[0] for call in mock_scandir.call_args_list]
+        assert scanned == [os.fspath(storage_config.base_path / "2026-02")]
+
 
 class TestGrayscaleImage:
     """Tests for grayscale image handling."""
 
     def test_save_grayscale_png(self, storage_config, sample_metadata):
         """Test saving grayscale image as PNG."""
-        grayscale = np.random.randint(0, 255, (480, 640), dtype=np.uint8)
         storage = ImageStorage(storage_config)
-        path = storage.save(grayscale, sample_metadata, image_type="png")
+        path = storage.save(GRAY_FRAME, sample_metadata, image_type="png")
         assert path.exists()
 
     def test_save_grayscale_fits(self, storage_config, sample_metadata):
         """Test saving grayscale image as FITS."""
-        grayscale = np.random.randint(0, 255, (480, 640), dtype=np.uint8)
         storage = ImageStorage(storage_config)
-        path = storage.save(grayscale, sample_metadata, image_type="fits")
+        path = storage.save(GRAY_FRAME, sample_metadata, image_type="fits")
         assert path.exists()
+
+
+class TestPngEncoder:
+    """Tests for PNG encoder selection."""
+
+    @pytest.fixture(autouse=True)
+    def _no_imagecodecs(self):
+        """Exercise the OpenCV and Pillow paths even if imagecodecs is installed."""
+        with patch("analemma.storage.IMAGECODECS_AVAILABLE", False):
+            yield
+
+    def test_imagecodecs_encoder_preferred(
+        self, storage_config, sample_image, sample_metadata
+    ):
+        """Test that imagecodecs encodes RGB frames at the configured level."""
+        mock_codecs = MagicMock()
+        mock_codecs.png_encode.return_value = b"\x89PNG"
+        storage_config.png_compress_level = 4
+        storage = ImageStorage(storage_config)
+
+        with patch("analemma.storage.IMAGECODECS_AVAILABLE", True), patch(
+            "analemma.storage.imagecodecs", mock_codecs, create=True
+        ), patch("analemma.storage.CV2_AVAILABLE", True), patch(
+            "analemma.storage.cv2"
+        ) as mock_cv2:
+            path = storage.save(sample_image, sample_metadata, image_type="png")
+
+        data = mock_codecs.png_encode.call_args[0][0]
+        np.testing.assert_array_equal(data, sample_image)
+        assert mock_codecs.png_encode.call_args[1] == {"level": 4}
+        mock_cv2.imwrite.assert_not_called()
+        assert path.read_bytes() == b"\x89PNG"
+
+    def test_opencv_encoder_used_when_available(
+        self, storage_config, sample_image, sample_metadata
+    ):
+        """Test that OpenCV writes RGB frames as BGR at the configured level."""
+        mock_cv2 = MagicMock()
+        mock_cv2.cvtColor.side_effect = lambda img, code: img[..., ::-1]
+        mock_cv2.imwrite.return_value = True
+        storage_config.png_compress_level = 3
+        storage = ImageStorage(storage_config)
+
+        with patch("analemma.storage.CV2_AVAILABLE", True), patch(
+            "analemma.storage.cv2", mock_cv2
+        ):
+            path = storage.save(sample_image, sample_metadata, image_type="png")
+
+        filename, data, params = mock_cv2.imwrite.call_args[0]
+        assert filename == str(path)
+        np.testing.assert_array_equal(data, sample_image[..., ::-1])
+        assert params == [mock_cv2.IMWRITE_PNG_COMPRESSION, 3]
+        assert path.with_suffix(".json").exists()
+
+    def test_pillow_encoder_uses_compress_level(
+        self, storage_config, sample_image, sample_metadata
+    ):
+        """Test that the Pillow fallback passes the configured level."""
+        storage_config.png_compress_level = 2
+        storage = ImageStorage(storage_config)
+
+        with patch("analemma.storage.CV2_AVAILABLE", False), patch(
+            "analemma.storage.Image.Image.save"
+        ) as mock_save:
+            storage.save(sample_image, sample_metadata, image_type="png")
+
+        assert mock_save.call_args[1]["compress_level"] == 2
+
+    def test_opencv_casts_non_uint8_natively(
+        self, storage_config, sample_image, sample_metadata
+    ):
+        """Test that non-uint8 frames are cast by OpenCV, not NumPy."""
+        mock_cv2 = MagicMock()
+        mock_cv2.convertScaleAbs.return_value = sample_image
+        mock_cv2.imwrite.return_value = True
+        storage = ImageStorage(storage_config)
+        image = np.zeros(sample_image.shape, dtype=np.float32)
+        image[0, 0, 0] = 2.0
+
+        with patch("analemma.storage.CV2_AVAILABLE", True), patch(
+            "analemma.storage.cv2", mock_cv2
+        ):
+            storage.save(image, sample_metadata, image_type="png")
+
+        mock_cv2.convertScaleAbs.assert_called_once_with(image, alpha=127.5, beta=0.0)
+        mock_cv2.cvtColor.assert_called_once_with(sample_image, mock_cv2.COLOR_RGB2BGR)
+
+    def test_opencv_write_failure_raises(
+        self, storage_config, sample_image, sample_metadata
+    ):
+        """Test that a failed OpenCV write raises StorageError."""
+        mock_cv2 = MagicMock()
+        mock_cv2.imwrite.return_value = False
+        storage = ImageStorage(storage_config)
+
+        with patch("analemma.storage.CV2_AVAILABLE", True), patch(
+            "analemma.storage.cv2", mock_cv2
+        ):
+            with pytest.raises(StorageError, match="Failed to save PNG"):
+                storage.save(sample_image, sample_metadata, image_type="png")
+
+
+class TestAsUint8:
+    """Tests for _as_uint8."""
+
+    def test_contiguous_uint8_not_copied(self, sample_image):
+        """Test that a contiguous uint8 array is returned as-is."""
+        assert _as_uint8(sample_image) is sample_image
+
+    def test_converts_other_dtypes_and_layouts(self, sample_image):
+        """Test that other dtypes and strided views are packed as uint8."""
+        result = _as_uint8(sample_image[:, ::2].astype(np.uint16))
+        assert result.dtype == np.uint8
+        assert result.flags.c_contiguous
+        np.testing.assert_array_equal(result, sample_image[:, ::2])
+
+
+class TestFitsDtype:
+    """Tests for the FITS pixel type option."""
+
+    def test_float_frames_unchanged_in_auto(self, storage_config, sample_metadata):
+        """Test that auto stores normalized float data without quantizing."""
+        image = np.array([[-0.5, 0.25], [0.75, 1.0]], dtype=np.float32)
+        storage = ImageStorage(storage_config)
+        path = storage.save(image, sample_metadata, image_type="fits")
+
+        with fits.open(path) as hdul:
+            assert hdul[0].header["BITPIX"] == -32
+            np.testing.assert_array_equal(hdul[0].data, image)
+
+    def test_float_frames_stored_as_uint16(self, storage_config, sample_metadata):
+        """Test that uint16 rounds, clips and stores float data as 16-bit."""
+        storage_config.fits_dtype = "uint16"
+        image = np.array([[-5.0, 1.6], [40000.2, 70000.0]], dtype=np.float32)
+        storage = ImageStorage(storage_config)
+        path = storage.save(image, sample_metadata, image_type="fits")
+
+        with fits.open(path) as hdul:
+            assert hdul[0].header["BITPIX"] == 16
+            assert hdul[0].data.dtype == np.uint16
+            np.testing.assert_array_equal(hdul[0].data, [[0, 2], [40000, 65535]])
+
+    def test_integer_frames_unchanged_in_auto(
+        self, storage_config, sample_image, sample_metadata
+    ):
+        """Test that auto keeps integer frames as they are."""
+        storage = ImageStorage(storage_config)
+        path = storage.save(sample_image, sample_metadata, image_type="fits")
+
+        with fits.open(path) as hdul:
+            assert hdul[0].header["BITPIX"] == 8
+
+    def test_scaling_cards_only_for_uint16(
+        self, storage_config, sample_image, sample_metadata
+    ):
+        """Test that BZERO is written for 16-bit frames and omitted for 8-bit."""
+        storage = ImageStorage(storage_config)
+        path8 = storage.save(sample_image, sample_metadata, image_type="fits")
+        with fits.open(path8, do_not_scale_image_data=True) as hdul:
+            assert "BZERO" not in hdul[0].header
+            assert "BSCALE" not in hdul[0].header
+
+        storage_config.fits_dtype = "uint16"
+        path16 = storage.save(sample_image, sample_metadata, image_type="fits")
+        with fits.open(path16, do_not_scale_image_data=True) as hdul:
+            assert hdul[0].header["BITPIX"] == 16
+            assert hdul[0].header["BZERO"] == 32768
+
+    def test_forced_uint8(self, storage_config, sample_metadata):
+        """Test that uint8 keeps the top byte of 16-bit frames."""
+        storage_config.fits_dtype = "uint8"
+        image = np.array([[0, 512], [65535, 255]], dtype=np.uint16)
+        storage = ImageStorage(storage_config)
+        path = storage.save(image, sample_metadata, image_type="fits")
+
+        with fits.open(path) as hdul:
+            np.testing.assert_array_equal(hdul[0].data, [[0, 2], [255, 0]])
+
+
+class TestFitsCompression:
+    """Tests for RICE tile-compressed FITS."""
+
+    def test_rice_round_trip(self, storage_config, sample_image, sample_metadata):
+        """Test that RICE-compressed FITS decompresses to the original data."""
+        storage_config.fits_compression = "rice"
+        storage = ImageStorage(storage_config)
+        path = storage.save(sample_image, sample_metadata, image_type="fits")
+
+        with fits.open(path) as hdul:
+            assert isinstance(hdul[1], fits.CompImageHDU)
+            assert hdul[1].header["INSTRUME"] == "ZWO ASI224MC"
+            np.testing.assert_array_equal(
+                hdul[1].data, np.transpose(sample_image, (2, 0, 1))
+            )
+
+    def test_rice_uint16_round_trip(self, storage_config, sample_metadata):
+        """Test that 16-bit frames survive RICE compression with BZERO."""
+        storage_config.fits_compression = "rice"
+        image = np.array([[0, 1000], [40000, 65535]], dtype=np.uint16)
+        storage = ImageStorage(storage_config)
+        path = storage.save(image, sample_metadata, image_type="fits")
+
+        with fits.open(path) as hdul:
+            assert hdul[1].data.dtype == np.uint16
+            np.testing.assert_array_equal(hdul[1].data, image)
+
+
+class TestFitsChecksum:
+    """Tests for optional FITS checksums."""
+
+    def test_checksum_disabled_by_default(self, storage_config, sample_image, sample_metadata):
+        """Test that FITS files are written without checksum cards by default."""
+        storage = ImageStorage(storage_config)
+        path = storage.save(sample_image, sample_metadata, image_type="fits")
+
+        with fits.open(path) as hdul:
+            assert "CHECKSUM" not in hdul[0].header
+
+    def test_checksum_enabled(self, storage_config, sample_image, sample_metadata):
+        """Test that fits_checksum adds verifiable CHECKSUM/DATASUM cards."""
+        storage_config.fits_checksum = True
+        storage = ImageStorage(storage_config)
+        path = storage.save(sample_image, sample_metadata, image_type="fits")
+
+        with fits.open(path, checksum=True) as hdul:
+            assert "CHECKSUM" in hdul[0].header
+            assert "DATASUM" in hdul[0].header
+
+
+class TestToUint8:
+    """Tests for _to_uint8."""
+
+    def test_uint16_keeps_high_byte(self):
+        """Test that 16-bit data is reduced to its top 8 bits."""
+        image = np.array([[0, 255, 256, 65535]], dtype=np.uint16)
+        np.testing.assert_array_equal(_to_uint8(image), [[0, 0, 1, 255]])
+
+    def test_float_stretched_to_full_range(self):
+        """Test that float data is stretched from min..max to 0..255."""
+        image = np.array([[-1.0, 0.0, 1.0]], dtype=np.float64)
+        result = _to_uint8(image)
+        assert result.dtype == np.uint8
+        np.testing.assert_array_equal(result, [[0, 128, 255]])
+
+    def test_constant_float_image(self):
+        """Test that a flat float image does not divide by zero."""
+        result = _to_uint8(np.full((2, 2), 3.0, dtype=np.float32))
+        np.testing.assert_array_equal(result, np.zeros((2, 2), dtype=np.uint8))
+
+
+class TestHdf5Storage:
+    """Tests for the monthly HDF5 frame cube."""
+
+    def test_appends_frames_to_monthly_cube(
+        self, storage_config, sample_image, sample_metadata
+    ):
+        """Test that each save appends one frame and its metadata."""
+        h5py = pytest.importorskip("h5py")
+        storage = ImageStorage(storage_config)
+
+        path = storage.save(sample_image, sample_metadata, image_type="hdf5")
+        later = replace(sample_metadata, capture_time="2026-01-17T12:00:00+09:00")
+        assert storage.save(sample_image // 2, later, image_type="hdf5") == path
+
+        assert path.name == "analemma_2026-01.h5"
+        with h5py.File(path, "r") as f:
+            assert f["frames"].shape == (2, *sample_image.shape)
+            np.testing.assert_array_equal(f["frames"][1], sample_image // 2)
+            assert json.loads(f["metadata"][1])["capture_time"] == later.capture_time
+
+    def test_shape_mismatch_raises(self, storage_config, sample_image, sample_metadata):
+        """Test that a frame of a different size is rejected."""
+        pytest.importorskip("h5py")
+        storage = ImageStorage(storage_config)
+        storage.save(sample_image, sample_metadata, image_type="hdf5")
+
+        with pytest.raises(StorageError, match="does not match"):
+            storage.save(sample_image[:10], sample_metadata, image_type="hdf5")
+
+    def test_native_dtype_preserved(self, storage_config, sample_metadata):
+        """Test that 16-bit and float frames are stored without quantizing."""
+        h5py = pytest.importorskip("h5py")
+        storage = ImageStorage(storage_config)
+        raw16 = np.array([[0, 1000], [40000, 65535]], dtype=np.uint16)
+        path = storage.save(raw16, sample_metadata, image_type="hdf5")
+
+        with h5py.File(path, "r") as f:
+            assert f["frames"].dtype == np.uint16
+            np.testing.assert_array_equal(f["frames"][0], raw16)
+
+        with pytest.raises(StorageError, match="does not match"):
+            storage.save(raw16.astype(np.float32), sample_metadata, image_type="hdf5")
+
+    def test_frames_counted_and_listed(
+        self, storage_config, sample_image, sample_metadata
+    ):
+        """Test that every appended frame counts as a capture."""
+        pytest.importorskip("h5py")
+        storage = ImageStorage(storage_config)
+        assert storage.get_storage_info().image_count == 0
+
+        path = storage.save(sample_image, sample_metadata, image_type="hdf5")
+        storage.save(sample_image, sample_metadata, image_type="hdf5")
+
+        assert storage.get_storage_info().image_count == 2
+        assert ImageStorage(storage_config).get_storage_info().image_count == 2
+        assert storage.list_images() == [path]
+
+    def test_swmr_reader_sees_metadata(
+        self, storage_config, sample_image, sample_metadata
+    ):
+        """Test that the cube can be opened by an SWMR reader."""
+        h5py = pytest.importorskip("h5py")
+        storage = ImageStorage(storage_config)
+        path = storage.save(sample_image, sample_metadata, image_type="hdf5")
+
+        with h5py.File(path, "r", libver="latest", swmr=True) as f:
+            assert f["metadata"].dtype.kind == "S"
+            row = json.loads(f["metadata"][0])
+            assert row["camera"]["model"] == "ZWO ASI224MC"
+
+    def test_requires_h5py(self, storage_config, sample_image, sample_metadata):
+        """Test that a missing h5py raises StorageError."""
+        storage = ImageStorage(storage_config)
+        with patch("analemma.storage.H5PY_AVAILABLE", False):
+            with pytest.raises(StorageError, match="h5py"):
+                storage.save(sample_image, sample_metadata, image_type="hdf5")